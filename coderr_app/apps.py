@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoderrAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coderr_app'
+
+    def ready(self):
+        from . import events
+
+        events.check_broker()
@@ -0,0 +1,103 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+GENERATION_KEY = 'offers:generation'
+HITS_KEY = 'offers:hits'
+MISSES_KEY = 'offers:misses'
+
+
+def get_offer_cache():
+    return caches[getattr(settings, 'OFFER_LIST_CACHE_ALIAS', 'default')]
+
+
+def get_offers_generation():
+    """
+    Returns the current offers generation.
+    A missing counter (first use or evicted) is seeded from the clock so entries
+    cached under an older generation can never match again.
+    """
+    cache = get_offer_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_offers_generation():
+    """
+    Invalidates every cached offer list in O(1) by moving to a new generation.
+    """
+    cache = get_offer_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def build_offer_list_key(request, prefix='list'):
+    """
+    Builds the cache key for an offer list request.
+    The key combines the generation, the host (responses contain absolute URLs)
+    and the query parameters normalized by name and value order.
+    """
+    params = sorted(
+        (name, value)
+        for name in request.query_params
+        for value in request.query_params.getlist(name)
+    )
+    raw = request.build_absolute_uri('/') + '?' + '&'.join(f'{name}={value}' for name, value in params)
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'offers:{prefix}:{get_offers_generation()}:{digest}'
+
+
+def get_cached_data(key):
+    """
+    Returns the cached response data for a key and records the hit or miss.
+    """
+    cache = get_offer_cache()
+    data = cache.get(key)
+    _increment(cache, HITS_KEY if data is not None else MISSES_KEY)
+    return data
+
+
+def set_cached_data(key, data):
+    get_offer_cache().set(key, to_plain_data(data))
+
+
+def get_cache_stats():
+    """
+    Returns hit and miss counts and the hit rate of the offer list cache.
+    """
+    cache = get_offer_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 3) if total else 0,
+        'generation': get_offers_generation(),
+    }
+
+
+def to_plain_data(data):
+    """
+    Copies serializer output into plain dicts and lists so it can be pickled without the serializer.
+    """
+    if isinstance(data, dict):
+        return {key: to_plain_data(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [to_plain_data(value) for value in data]
+    return data
+
+
+def _increment(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
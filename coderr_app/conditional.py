@@ -0,0 +1,64 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    View mixin answering GET/HEAD with 304 Not Modified before any serialization runs.
+    Subclasses implement get_conditional_state(), which returns (last_modified, version parts)
+    from one small query or a stored version, or None to skip the check (e.g. when the object
+    does not exist).
+    Lists set last_modified_validates = False: a deleted row does not move max(updated_at),
+    so If-Modified-Since is only honoured for single objects while the ETag covers both.
+    """
+    last_modified_validates = True
+
+    def get_conditional_state(self, request):
+        raise NotImplementedError('get_conditional_state() must be implemented in subclasses.')
+
+    def get_list_conditional_state(self, queryset):
+        """
+        Returns the validator state of a list from a single aggregate over the filtered queryset.
+        """
+        state = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        return state['last_modified'], (state['last_modified'], state['count'])
+
+    def build_etag(self, request, parts):
+        """
+        Builds a strong ETag from the request URL, query parameters, accepted media type and version parts.
+        """
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+        )
+        raw = repr((request.build_absolute_uri(request.path), params, request.META.get('HTTP_ACCEPT', ''), parts))
+        return '"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        state = self.get_conditional_state(request)
+        if state is None:
+            return super().get(request, *args, **kwargs)
+
+        last_modified, parts = state
+        etag = self.build_etag(request, parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=timestamp if self.last_modified_validates else None,
+        )
+        if not_modified is not None:
+            if not_modified.status_code == 304:
+                not_modified['ETag'] = etag
+            return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
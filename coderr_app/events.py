@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+RESYNC = {'type': 'resync'}
+
+STREAM_TOKEN_SALT = 'coderr_app.events.stream'
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def issue_stream_token(user):
+    """
+    Returns a signed token that lets the user open the order event stream for ORDER_EVENTS_TOKEN_MAX_AGE seconds.
+    It is only accepted by the stream, so the URL never carries the user's API token.
+    """
+    return signing.dumps(user.pk, salt=STREAM_TOKEN_SALT)
+
+
+def read_stream_token(value):
+    """
+    Returns the user ID of a valid, unexpired stream token, or None.
+    """
+    try:
+        return signing.loads(value, salt=STREAM_TOKEN_SALT, max_age=getattr(settings, 'ORDER_EVENTS_TOKEN_MAX_AGE', 60))
+    except signing.BadSignature:
+        return None
+
+
+def get_broker_class():
+    return import_string(getattr(settings, 'ORDER_EVENTS_BROKER', 'coderr_app.events.LocalBroker'))
+
+
+def check_broker():
+    """
+    Fails at startup when the configured broker cannot work, e.g. RedisBroker without the redis package.
+    """
+    broker_class = get_broker_class()
+    if issubclass(broker_class, RedisBroker):
+        try:
+            import redis  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured('ORDER_EVENTS_BROKER is RedisBroker, but the redis package is not installed (pip install redis).')
+
+
+class Subscription:
+    """
+    A bounded queue of events for one listener. When a slow client lets the queue fill up,
+    further events are dropped and a single resync event tells it to reload instead.
+    """
+
+    def __init__(self, broker, channel, loop, max_size):
+        self.broker = broker
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        """
+        Called on the subscriber's event loop.
+        """
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.queue.maxsize - 1:
+            self.overflowed = True
+            event = RESYNC
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """
+        Waits for the next event; returns None when the timeout passes without one.
+        """
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is RESYNC:
+            self.overflowed = False
+        return event
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """
+    In-process pub/sub. Events can be published from any thread (e.g. a request worker thread
+    after commit) and are handed to the subscribers' event loops without polling, so an idle
+    subscriber only costs an empty queue.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, asyncio.get_running_loop(), self.queue_size)
+        with self.lock:
+            self.subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            listeners = self.subscribers.get(subscription.channel)
+            if listeners is not None:
+                listeners.discard(subscription)
+                if not listeners:
+                    del self.subscribers[subscription.channel]
+
+    def publish(self, channel, event):
+        self.dispatch(channel, event)
+
+    def dispatch(self, channel, event):
+        """
+        Hands an event to every subscriber of the channel in this process.
+        """
+        with self.lock:
+            listeners = list(self.subscribers.get(channel, ()))
+        for subscription in listeners:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Broker for several worker processes. Events are published to Redis, and each process
+    runs one listener task that feeds its local subscribers, so there is a single Redis
+    connection per worker no matter how many clients are connected.
+    Requires the redis package (checked when the app starts) and ORDER_EVENTS_REDIS_URL.
+    """
+    channel_prefix = 'coderr:events:'
+
+    def __init__(self, queue_size=100):
+        super().__init__(queue_size)
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured('RedisBroker requires the redis package.')
+        self.redis = redis
+        self.url = getattr(settings, 'ORDER_EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+        self.client = redis.Redis.from_url(self.url)
+        self.listener = None
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.get_running_loop().create_task(self.listen())
+        return subscription
+
+    def publish(self, channel, event):
+        self.client.publish(self.channel_prefix + channel, json.dumps(event, cls=DjangoJSONEncoder))
+
+    async def listen(self):
+        from redis import asyncio as redis_asyncio
+
+        client = redis_asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(self.channel_prefix + '*')
+        try:
+            async for message in pubsub.listen():
+                if message['type'] != 'pmessage':
+                    continue
+                channel = message['channel'].decode()[len(self.channel_prefix):]
+                self.dispatch(channel, json.loads(message['data']))
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+def get_broker():
+    """
+    Returns the process-wide broker configured by ORDER_EVENTS_BROKER.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = get_broker_class()(queue_size=getattr(settings, 'ORDER_EVENTS_QUEUE_SIZE', 100))
+    return _broker
+
+
+def order_payload(order):
+    return {
+        'id': order.id,
+        'status': order.status,
+        'title': order.title,
+        'customer_user': order.customer_user_id,
+        'business_user': order.business_user_id,
+        'updated_at': order.updated_at,
+    }
+
+
+def publish_order_events(event_type, orders):
+    """
+    Publishes an event per order to its customer and business user once the transaction commits.
+    """
+    events = [
+        (user_channel(user_id), {'type': event_type, 'order': order_payload(order)})
+        for order in orders
+        for user_id in {order.customer_user_id, order.business_user_id}
+    ]
+
+    def send():
+        broker = get_broker()
+        for channel, event in events:
+            try:
+                broker.publish(channel, event)
+            except Exception:
+                logger.exception('Publishing %s to %s failed.', event['type'], channel)
+
+    if events:
+        transaction.on_commit(send)
@@ -0,0 +1,79 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def get_expiry_cutoff():
+    """
+    Returns the creation time before which stored keys are expired (IDEMPOTENCY_KEY_TTL seconds).
+    """
+    return timezone.now() - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+
+
+def purge_expired_keys():
+    """
+    Deletes expired idempotency keys and returns how many were removed.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=get_expiry_cutoff()).delete()
+    return deleted
+
+
+def hash_request(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    View mixin making create() safe to retry with an Idempotency-Key header.
+    The key is claimed in the same transaction that creates the object, so a concurrent retry
+    waits for the first request and then receives its stored response. Failed requests are rolled
+    back together with the key and can be retried with a corrected body.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"detail": "The Idempotency-Key header must not exceed 255 characters."}, status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = hash_request(request)
+        lookup = {'user': request.user, 'path': request.path, 'key': key}
+        IdempotencyKey.objects.filter(created_at__lt=get_expiry_cutoff(), **lookup).delete()
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(request_hash=request_hash, **lookup)
+            except IntegrityError:
+                return self.replay_response(lookup, request_hash)
+
+            response = super().create(request, *args, **kwargs)
+            if not status.is_success(response.status_code):
+                transaction.set_rollback(True)
+                return response
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=['response_status', 'response_body'])
+        return response
+
+    def replay_response(self, lookup, request_hash):
+        """
+        Returns the stored response for a key that was already used.
+        """
+        record = IdempotencyKey.objects.filter(**lookup).first()
+        if record is None or record.response_status is None:
+            return Response({"detail": "A request with this Idempotency-Key is still being processed."}, status=status.HTTP_409_CONFLICT)
+        if record.request_hash != request_hash:
+            return Response({"detail": "This Idempotency-Key was already used with a different request."}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(record.response_body, status=record.response_status, headers={'Idempotent-Replayed': 'true'})
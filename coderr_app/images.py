@@ -0,0 +1,151 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_executor = None
+
+
+def get_variant_sizes():
+    return getattr(settings, 'IMAGE_VARIANTS', {'thumb': (160, 160), 'card': (480, 320)})
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2),
+            thread_name_prefix='image-derivatives',
+        )
+    return _executor
+
+
+def variant_name(source_name, variant, extension):
+    """
+    Returns the storage name of a derivative, stored next to the original (e.g. offer_images/logo.thumb.webp).
+    """
+    stem, _ = os.path.splitext(source_name)
+    return f'{stem}.{variant}.{extension}'
+
+
+def flatten(image):
+    """
+    Converts an image to RGB, placing transparent images on a white background.
+    """
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_derivatives(source_name):
+    """
+    Generates every configured size in every format for a stored image.
+    Returns the variants mapping {'source': name, variant: {format: name}}, or None if the file is not an image.
+    """
+    try:
+        with default_storage.open(source_name, 'rb') as source:
+            original = Image.open(source)
+            original.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning('Could not read image %s for derivatives.', source_name)
+        return None
+
+    original = flatten(ImageOps.exif_transpose(original))
+    variants = {'source': source_name}
+    for variant, size in get_variant_sizes().items():
+        image = ImageOps.fit(original, tuple(size), Image.Resampling.LANCZOS)
+        variants[variant] = {}
+        for extension, (pillow_format, options) in FORMATS.items():
+            buffer = BytesIO()
+            image.save(buffer, pillow_format, **options)
+            name = variant_name(source_name, variant, extension)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            variants[variant][extension] = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def generate_for_instance(model, pk, field_name, variants_field):
+    """
+    Builds the derivatives for one model instance and stores the resulting names on it.
+    The row is only updated if it still points at the same source image.
+    """
+    source_name = model.objects.filter(pk=pk).values_list(field_name, flat=True).first()
+    if not source_name:
+        return None
+    variants = render_derivatives(source_name)
+    if variants is None:
+        return None
+    updated = model.objects.filter(pk=pk, **{field_name: source_name}).update(
+        **{variants_field: variants, 'updated_at': timezone.now()}
+    )
+    if updated:
+        cache.bump_offers_generation()
+    return variants
+
+
+def _run_in_background(model, pk, field_name, variants_field):
+    try:
+        generate_for_instance(model, pk, field_name, variants_field)
+    except Exception:
+        logger.exception('Generating image derivatives for %s %s failed.', model.__name__, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_derivatives(instance, field_name, variants_field):
+    """
+    Queues derivative generation after the current transaction commits, off the request thread.
+    Clears stale variants right away when the image was removed. Set IMAGE_DERIVATIVES_ASYNC = False
+    to generate inline instead (useful in tests and management commands).
+    """
+    source = getattr(instance, field_name)
+    variants = getattr(instance, variants_field) or {}
+    model = type(instance)
+    if not source:
+        if variants:
+            model.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+            setattr(instance, variants_field, {})
+        return
+    if variants.get('source') == source.name:
+        return
+
+    args = (model, instance.pk, field_name, variants_field)
+    if getattr(settings, 'IMAGE_DERIVATIVES_ASYNC', True):
+        transaction.on_commit(lambda: get_executor().submit(_run_in_background, *args))
+    else:
+        transaction.on_commit(lambda: generate_for_instance(*args))
+
+
+def variant_urls(variants, request=None):
+    """
+    Turns a stored variants mapping into absolute URLs for API responses.
+    """
+    urls = {}
+    for variant, formats in (variants or {}).items():
+        if variant == 'source':
+            continue
+        urls[variant] = {}
+        for extension, name in formats.items():
+            url = default_storage.url(name)
+            urls[variant][extension] = request.build_absolute_uri(url) if request else url
+    return urls
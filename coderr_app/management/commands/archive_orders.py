@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...models import ArchivedOrder, Order
+
+
+class Command(BaseCommand):
+    help = 'Moves orders that were completed or cancelled more than N days ago into the archive table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'ORDER_ARCHIVE_AFTER_DAYS', 90),
+            help='Archive orders closed more than this many days ago.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of orders moved per transaction.')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches; run again to continue.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the orders that would be archived.')
+
+    def handle(self, *args, **options):
+        closed_before = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            pending = Order.objects.filter(
+                status__in=ArchivedOrder.ARCHIVABLE_STATUSES, updated_at__lt=closed_before
+            ).count()
+            self.stdout.write(f'{pending} orders would be archived.')
+            return
+
+        archived = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            moved = ArchivedOrder.archive_batch(closed_before, batch_size=options['batch_size'])
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            self.stdout.write(f'Archived {archived} orders so far.')
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} orders in {batches} batches.'))
@@ -0,0 +1,107 @@
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...models import BLOB_FIELDS, Offer, Profile, StoredBlob
+from ...storage import get_blob_dir, get_content_storage, is_blob_name
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts StoredBlob references and deletes files under CONTENT_STORAGE_DIR that no offer, '
+        'profile, file upload or image variant refers to. Upload session temp files are left to purge_upload_sessions.'
+    )
+
+    variant_fields = ((Offer, 'image_variants'), (Profile, 'file_variants'))
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted.')
+        parser.add_argument(
+            '--grace-minutes', type=int, default=60,
+            help='Keep files younger than this, so uploads whose row is not committed yet survive.',
+        )
+
+    def handle(self, *args, **options):
+        references = self.collect_references()
+        recounted = self.recount_blobs(references, options['dry_run'])
+        keep = set(references) | self.collect_variant_names()
+
+        root = settings.MEDIA_ROOT
+        cutoff = time.time() - options['grace_minutes'] * 60
+        deleted = freed = 0
+        for directory, _, filenames in os.walk(os.path.join(root, get_blob_dir())):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                if name in keep:
+                    continue
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                deleted += 1
+                freed += stat.st_size
+                if options['dry_run']:
+                    self.stdout.write(f'Would delete {name}')
+                else:
+                    os.remove(path)
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} orphaned files ({freed} bytes); corrected {recounted} blob reference counts.'
+        ))
+
+    def collect_references(self):
+        """
+        Returns how many rows refer to each stored file name.
+        """
+        references = Counter()
+        for model, field_names in BLOB_FIELDS.items():
+            for field_name in field_names:
+                queryset = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                references.update(queryset.values_list(field_name, flat=True).iterator(chunk_size=1000))
+        return references
+
+    def collect_variant_names(self):
+        names = set()
+        for model, field_name in self.variant_fields:
+            for variants in model.objects.exclude(**{field_name: {}}).values_list(field_name, flat=True).iterator(chunk_size=1000):
+                for variant, formats in (variants or {}).items():
+                    if variant != 'source':
+                        names.update(formats.values())
+        return names
+
+    def recount_blobs(self, references, dry_run):
+        """
+        Brings StoredBlob rows in line with the actual references and drops blobs nobody uses.
+        Returns the number of rows that were wrong.
+        """
+        storage = get_content_storage()
+        blob_references = {name: count for name, count in references.items() if is_blob_name(name)}
+        corrected = 0
+        for blob in StoredBlob.objects.iterator(chunk_size=1000):
+            count = blob_references.pop(blob.name, 0)
+            if blob.ref_count == count and count:
+                continue
+            corrected += 1
+            if dry_run:
+                continue
+            if count:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=count)
+            else:
+                blob.delete()
+        missing = [
+            StoredBlob(
+                name=name,
+                sha256=os.path.splitext(os.path.basename(name))[0],
+                size=storage.size(name) if storage.exists(name) else 0,
+                ref_count=count,
+            )
+            for name, count in blob_references.items()
+        ]
+        corrected += len(missing)
+        if missing and not dry_run:
+            StoredBlob.objects.bulk_create(missing, ignore_conflicts=True)
+        return corrected
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from ... import images
+from ...models import Offer, Profile
+
+
+class Command(BaseCommand):
+    help = 'Generates thumbnail and WebP/JPEG variants for existing offer images and profile pictures.'
+
+    targets = {
+        'offers': (Offer, 'image', 'image_variants'),
+        'profiles': (Profile, 'file', 'file_variants'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=sorted(self.targets), help='Only process offers or profiles.')
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that already exist.')
+
+    def handle(self, *args, **options):
+        names = [options['only']] if options['only'] else sorted(self.targets)
+        for name in names:
+            model, field_name, variants_field = self.targets[name]
+            queryset = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            generated = skipped = failed = 0
+            for pk, source_name, variants in queryset.values_list('pk', field_name, variants_field).iterator(chunk_size=200):
+                if not options['force'] and (variants or {}).get('source') == source_name:
+                    skipped += 1
+                    continue
+                if images.generate_for_instance(model, pk, field_name, variants_field):
+                    generated += 1
+                else:
+                    failed += 1
+            self.stdout.write(self.style.SUCCESS(
+                f'{name}: generated {generated}, skipped {skipped}, failed {failed}.'
+            ))
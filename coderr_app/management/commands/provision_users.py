@@ -0,0 +1,146 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from ...models import Profile
+
+User = get_user_model()
+
+PROFILE_COLUMNS = ('first_name', 'last_name', 'location', 'tel', 'description', 'working_hours')
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates users with their profiles and tokens from a CSV file with the columns username, email and '
+        'optionally password, type (default customer), ' + ', '.join(PROFILE_COLUMNS) + '. Rows without a '
+        'password get an unusable one. The file is validated completely before anything is written.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path of the CSV file (UTF-8, with a header row).')
+        parser.add_argument(
+            '--hasher', default='default',
+            help='Password hasher algorithm from PASSWORD_HASHERS (e.g. pbkdf2_sha256, argon2); defaults to the first one.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of users inserted per transaction.')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Threads hashing passwords in parallel (the hashers release the GIL).',
+        )
+        parser.add_argument('--skip-existing', action='store_true', help='Skip usernames that already exist instead of failing.')
+        parser.add_argument('--tokens-out', help='Write username, user_id and token of the created users to this CSV file.')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the file.')
+
+    def handle(self, *args, **options):
+        hasher = options['hasher']
+        try:
+            get_hasher(hasher)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be at least 1.')
+
+        rows = self.read_rows(options['csv_file'])
+        existing = self.find_existing([row['username'] for row in rows])
+        if existing and not options['skip_existing']:
+            raise CommandError(
+                f'{len(existing)} usernames already exist (use --skip-existing): ' + ', '.join(sorted(existing)[:20])
+            )
+        rows = [row for row in rows if row['username'] not in existing]
+        if options['dry_run']:
+            self.stdout.write(f'{len(rows)} users would be created, {len(existing)} skipped.')
+            return
+
+        created = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for start in range(0, len(rows), options['batch_size']):
+                batch = rows[start:start + options['batch_size']]
+                # make_password(None) returns an unusable password, like set_unusable_password().
+                passwords = executor.map(
+                    lambda password: make_password(password or None, hasher=hasher),
+                    [row.get('password') for row in batch],
+                )
+                created += self.create_batch(batch, list(passwords))
+                self.stdout.write(f'Created {len(created)} of {len(rows)} users.')
+
+        if options['tokens_out']:
+            with open(options['tokens_out'], 'w', newline='', encoding='utf-8') as output:
+                writer = csv.writer(output)
+                writer.writerow(['username', 'user_id', 'token'])
+                writer.writerows(created)
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} users, skipped {len(existing)}.'))
+
+    def read_rows(self, path):
+        """
+        Reads and validates the CSV file; raises CommandError listing every invalid line.
+        """
+        types = {choice for choice, label in User.TYPE_CHOICES}
+        rows, errors, seen = [], [], set()
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as source:
+                reader = csv.DictReader(source)
+                missing = {'username', 'email'} - set(reader.fieldnames or ())
+                if missing:
+                    raise CommandError(f"Missing columns: {', '.join(sorted(missing))}.")
+                for line, raw in enumerate(reader, start=2):
+                    row = {name: (value or '').strip() for name, value in raw.items() if name}
+                    row['username'] = User.normalize_username(row['username'])
+                    row['email'] = User.objects.normalize_email(row['email'])
+                    row['type'] = row.get('type') or 'customer'
+                    problems = []
+                    if not row['username']:
+                        problems.append('username is empty')
+                    elif row['username'] in seen:
+                        problems.append(f"username {row['username']} appears twice")
+                    try:
+                        validate_email(row['email'])
+                    except ValidationError:
+                        problems.append(f"invalid email {row['email']!r}")
+                    if row['type'] not in types:
+                        problems.append(f"type must be one of {', '.join(sorted(types))}")
+                    for name in PROFILE_COLUMNS:
+                        max_length = Profile._meta.get_field(name).max_length
+                        if max_length and len(row.get(name, '')) > max_length:
+                            problems.append(f'{name} is longer than {max_length} characters')
+                    if problems:
+                        errors.append(f"line {line}: {'; '.join(problems)}")
+                    seen.add(row['username'])
+                    rows.append(row)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        if errors:
+            raise CommandError(f'{len(errors)} invalid rows:\n' + '\n'.join(errors[:50]))
+        return rows
+
+    def find_existing(self, usernames, chunk_size=500):
+        existing = set()
+        for start in range(0, len(usernames), chunk_size):
+            existing.update(
+                User.objects.filter(username__in=usernames[start:start + chunk_size]).values_list('username', flat=True)
+            )
+        return existing
+
+    def create_batch(self, rows, password_hashes):
+        """
+        Inserts one batch of users, profiles and tokens with three bulk INSERTs in one transaction.
+        bulk_create skips the post_save signal, so the profiles are created here.
+        """
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=row['username'], email=row['email'], type=row['type'], password=password_hash)
+                for row, password_hash in zip(rows, password_hashes)
+            ])
+            Profile.objects.bulk_create([
+                Profile(user=user, **{name: row.get(name, '') for name in PROFILE_COLUMNS})
+                for user, row in zip(users, rows)
+            ])
+            tokens = Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+        return [(user.username, user.pk, token.key) for user, token in zip(users, tokens)]
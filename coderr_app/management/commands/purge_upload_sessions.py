@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...uploads import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Deletes upload sessions without activity for FILE_UPLOAD_SESSION_TTL and their temp files.'
+
+    def handle(self, *args, **options):
+        sessions, files = purge_expired_sessions()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {sessions} expired upload sessions and {files} orphaned temp files.'))
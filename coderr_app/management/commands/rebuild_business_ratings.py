@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import BusinessRating
+
+
+class Command(BaseCommand):
+    help = 'Checks the per-business rating statistics against the reviews and rebuilds them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report business users whose statistics differ; exits with an error if any do.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = BusinessRating.find_mismatches()
+            if mismatches:
+                raise CommandError(
+                    f'{len(mismatches)} business users have outdated rating statistics: '
+                    + ', '.join(str(user_id) for user_id in mismatches)
+                )
+            self.stdout.write(self.style.SUCCESS('All rating statistics are consistent.'))
+            return
+        rebuilt = BusinessRating.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating statistics for {rebuilt} business users.'))
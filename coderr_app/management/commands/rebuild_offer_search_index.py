@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ... import search
+from ...models import Offer
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for offers from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of offers inserted per batch.')
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('The offer search index is only available on SQLite.')
+        with transaction.atomic():
+            indexed = search.rebuild_index(Offer.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} offers.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...models import BusinessOrderCounter
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the per-business order counters from the orders table.'
+
+    def handle(self, *args, **options):
+        rebuilt = BusinessOrderCounter.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt order counters for {rebuilt} business users.'))
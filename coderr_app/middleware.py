@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .query_budget import (
+    BUDGETED_METHODS,
+    QueryBudgetExceeded,
+    QueryCounter,
+    get_budget_violation,
+    logger as query_budget_logger,
+)
+
+
+class QueryBudgetMiddleware:
+    """
+    Debug middleware that checks every read request against the query_budget of its view.
+    Logs a warning by default; set QUERY_BUDGET_RAISE = True to raise QueryBudgetExceeded instead.
+    Only active when DEBUG is on.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.raise_on_violation = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+
+    def __call__(self, request):
+        if request.method not in BUDGETED_METHODS:
+            return self.get_response(request)
+
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None:
+            violation = get_budget_violation(resolver_match.func, counter)
+            if violation:
+                if self.raise_on_violation:
+                    raise QueryBudgetExceeded(f"{request.method} {request.path}: {violation}")
+                query_budget_logger.warning("%s %s: %s", request.method, request.path, violation)
+        return response
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:24
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def backfill_min_values(apps, schema_editor):
+    Offer = apps.get_model('coderr_app', 'Offer')
+    for offer in Offer.objects.annotate(
+        min_price_value=Min('details__price'),
+        min_delivery_time_value=Min('details__delivery_time_in_days'),
+    ).iterator():
+        Offer.objects.filter(pk=offer.pk).update(
+            min_price=offer.min_price_value,
+            min_delivery_time=offer.min_delivery_time_value,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0013_alter_profile_working_hours'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_min_values, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:27
+
+import coderr_app.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def get_index_row(offer):
+    """
+    Frozen copy of the row builder in coderr_app.search as it was when the index was introduced.
+    """
+    parts = []
+    for detail in offer.details.all():
+        parts.append(detail.title or '')
+        features = detail.features if isinstance(detail.features, list) else []
+        parts.extend(str(feature) for feature in features)
+    details = ' '.join(part for part in parts if part)
+    return (offer.pk, offer.title, offer.description, details)
+
+
+def create_offer_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Offer = apps.get_model('coderr_app', 'Offer')
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS coderr_app_offer_fts "
+        "USING fts5(title, description, details, tokenize='unicode61 remove_diacritics 2')"
+    )
+    with schema_editor.connection.cursor() as cursor:
+        for offer in Offer.objects.prefetch_related('details').iterator(chunk_size=500):
+            cursor.execute(
+                'INSERT INTO coderr_app_offer_fts (rowid, title, description, details) VALUES (%s, %s, %s, %s)',
+                get_index_row(offer),
+            )
+
+
+def drop_offer_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS coderr_app_offer_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0014_offer_min_price_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferSearchIndex',
+            fields=[
+                ('offer', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='coderr_app.offer')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('details', models.TextField()),
+                ('document', coderr_app.models.SearchDocumentField(db_column='coderr_app_offer_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'coderr_app_offer_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_offer_search_table, drop_offer_search_table),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0017_offerdetail_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='file_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:41
+
+import coderr_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0019_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='fileupload',
+            name='file',
+            field=models.FileField(storage=coderr_app.storage.get_content_storage, upload_to='uploaded_files/'),
+        ),
+        migrations.AlterField(
+            model_name='offer',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=coderr_app.storage.get_content_storage, upload_to='offer_images/'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='file',
+            field=models.ImageField(blank=True, null=True, storage=coderr_app.storage.get_content_storage, upload_to='profile_pictures/'),
+        ),
+    ]
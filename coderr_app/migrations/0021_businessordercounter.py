@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Order = apps.get_model('coderr_app', 'Order')
+    BusinessOrderCounter = apps.get_model('coderr_app', 'BusinessOrderCounter')
+    counters = {}
+    for row in Order.objects.order_by().values('business_user_id', 'status').annotate(total=Count('pk')):
+        counter = counters.setdefault(row['business_user_id'], BusinessOrderCounter(business_user_id=row['business_user_id']))
+        if row['status'] in ('in_progress', 'completed', 'cancelled'):
+            setattr(counter, row['status'], row['total'])
+    BusinessOrderCounter.objects.bulk_create(counters.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0020_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
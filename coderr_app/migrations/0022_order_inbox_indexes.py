@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0021_businessordercounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'status', 'created_at'], name='order_customer_inbox_idx'),
+        ),
+    ]
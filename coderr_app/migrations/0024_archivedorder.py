@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0023_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('revisions', models.IntegerField()),
+                ('delivery_time_in_days', models.IntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('features', models.JSONField()),
+                ('offer_type', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_business_orders', to=settings.AUTH_USER_MODEL)),
+                ('customer_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_customer_orders', to=settings.AUTH_USER_MODEL)),
+                ('offer_detail', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='coderr_app.offerdetail')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['business_user', 'status', 'created_at'], name='archived_business_inbox_idx'), models.Index(fields=['customer_user', 'status', 'created_at'], name='archived_customer_inbox_idx')],
+            },
+        ),
+    ]
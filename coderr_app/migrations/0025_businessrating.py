@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    Review = apps.get_model('coderr_app', 'Review')
+    BusinessRating = apps.get_model('coderr_app', 'BusinessRating')
+    ratings = {}
+    for row in Review.objects.order_by().values('business_user_id', 'rating').annotate(total=Count('pk')):
+        rating = ratings.setdefault(row['business_user_id'], BusinessRating(business_user_id=row['business_user_id']))
+        rating.review_count += row['total']
+        rating.rating_sum += row['rating'] * row['total']
+        field = f"stars_{row['rating']}"
+        setattr(rating, field, getattr(rating, field) + row['total'])
+    BusinessRating.objects.bulk_create(ratings.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0024_archivedorder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRating',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
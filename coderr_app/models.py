@@ -1,9 +1,25 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import uuid
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Min
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_init, post_save, post_delete
+from django.utils import timezone
 from django.dispatch import receiver
 
+from . import cache, events, images, search
+from .storage import get_content_storage, is_blob_name
+
+_offer_detail_sync_suppressed = ContextVar('offer_detail_sync_suppressed', default=False)
+_order_counter_sync_suppressed = ContextVar('order_counter_sync_suppressed', default=False)
+
 class CustomUser(AbstractUser):  
     TYPE_CHOICES = [
         ('customer', 'Customer'),
@@ -18,49 +34,163 @@ class Profile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='profile')
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
-    file = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)  
+    file = models.ImageField(upload_to='profile_pictures/', storage=get_content_storage, blank=True, null=True)  
+    file_variants = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=100, blank=True)
     tel = models.CharField(max_length=20, blank=True)
     description = models.TextField(blank=True)
     working_hours = models.CharField(max_length=500, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Profile of {self.user.username}"
 
+# User fields shown on the profile; changing one of them moves the profile's updated_at.
+PROFILE_USER_FIELDS = ('username', 'email', 'type')
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_profile_user_fields(sender, instance, **kwargs):
+    instance._loaded_profile_fields = tuple(instance.__dict__.get(name) for name in PROFILE_USER_FIELDS)
+
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_or_update_user_profile(sender, instance, created, **kwargs):
+    """
+    Creates the profile of a new user. Later saves only touch the profile's updated_at, and
+    invalidate the cached offer lists that show the username, when a field it shows changed,
+    so logins (last_login) and password changes write nothing else.
+    """
+    current = tuple(getattr(instance, name) for name in PROFILE_USER_FIELDS)
     if created:
         Profile.objects.create(user=instance)
-    instance.profile.save()
+    elif current != instance._loaded_profile_fields:
+        Profile.objects.filter(user=instance).update(updated_at=timezone.now())
+        transaction.on_commit(cache.bump_offers_generation)
+    instance._loaded_profile_fields = current
+
+@receiver(post_save, sender=Profile)
+def schedule_profile_picture_derivatives(sender, instance, **kwargs):
+    images.schedule_derivatives(instance, 'file', 'file_variants')
 
 class FileUpload(models.Model):
-    file = models.FileField(upload_to='uploaded_files/')  
+    file = models.FileField(upload_to='uploaded_files/', storage=get_content_storage)  
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return str(self.file)
+
+class StoredBlob(models.Model):
+    """
+    A content-addressed file and the number of model fields pointing at it.
+    A blob whose count drops to zero is deleted together with its file.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} references)"
+
+    @classmethod
+    def retain(cls, name):
+        """
+        Adds a reference to the blob stored under name, registering the blob on first use.
+        """
+        if not is_blob_name(name):
+            return
+        storage = get_content_storage()
+        blob, created = cls.objects.get_or_create(
+            name=name,
+            defaults={
+                'sha256': os.path.splitext(os.path.basename(name))[0],
+                'size': storage.size(name) if storage.exists(name) else 0,
+                'ref_count': 1,
+            },
+        )
+        if not created:
+            cls.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+
+    @classmethod
+    def release(cls, name):
+        """
+        Drops a reference; once the transaction commits, a blob without references is removed from disk.
+        """
+        if not is_blob_name(name):
+            return
+        cls.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+        transaction.on_commit(lambda: cls.delete_unreferenced(name))
+
+    @classmethod
+    def delete_unreferenced(cls, name):
+        """
+        Deletes the blob and its file if it still has no references once its row is locked.
+        A file saved again moments ago is kept (with its row) for the reference about to be added;
+        collect_orphaned_media removes it later if that never happens.
+        """
+        storage = get_content_storage()
+        with transaction.atomic():
+            blob = cls.objects.select_for_update().filter(name=name, ref_count=0).first()
+            if blob is None or storage.was_saved_recently(name):
+                return
+            blob.delete()
+            storage.delete(name)
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress: chunks are appended to a temp file under MEDIA_ROOT
+    until offset reaches size, then the file becomes a FileUpload.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    expected_checksum = models.CharField(max_length=64, blank=True)
+    upload = models.OneToOneField(FileUpload, on_delete=models.SET_NULL, null=True, blank=True, related_name='session')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.offset}/{self.size})"
     
 class Offer(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='offers')
     title = models.CharField(max_length=255)
-    image = models.ImageField(upload_to='offer_images/', blank=True, null=True)
+    image = models.ImageField(upload_to='offer_images/', storage=get_content_storage, blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, db_index=True)
+    min_delivery_time = models.IntegerField(blank=True, null=True, db_index=True)
     
     def __str__(self):
         return self.title
-    
-    @property
-    def min_price(self):
-        prices = [detail.price for detail in self.details.all() if detail.price is not None]
-        return min(prices) if prices else None  
 
-    @property
-    def min_delivery_time(self):
-        delivery_times = [detail.delivery_time_in_days for detail in self.details.all() if detail.delivery_time_in_days is not None]  # Corrected attribute name
-        return min(delivery_times) if delivery_times else None
+    def refresh_min_values(self):
+        """
+        Recomputes min_price and min_delivery_time from the offer details.
+        Stores the values in the database and on this instance; a detail change also counts
+        as an update of the offer, so updated_at moves too.
+        """
+        values = self.details.aggregate(
+            min_price=Min('price'),
+            min_delivery_time=Min('delivery_time_in_days'),
+        )
+        values['updated_at'] = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(**values)
+        self.min_price = values['min_price']
+        self.min_delivery_time = values['min_delivery_time']
+        self.updated_at = values['updated_at']
+
+    def sync_from_details(self):
+        """
+        Refreshes everything derived from the offer details: stored minimum values and the search index entry.
+        """
+        self.refresh_min_values()
+        search.index_offer(self)
 
 class OfferDetail(models.Model):
     OFFER_TYPE_CHOICES = [
@@ -76,9 +206,140 @@ class OfferDetail(models.Model):
     features = models.JSONField(default=list, blank=True)  
     offer_type = models.CharField(max_length=20, choices=OFFER_TYPE_CHOICES, blank=True, default="") # Added offer_type
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+            models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_delivery_idx'),
+        ]
+
     def __str__(self):
         return f"Detail for {self.offer.title}"
-    
+
+@receiver([post_save, post_delete], sender=OfferDetail)
+def sync_offer_from_details(sender, instance, **kwargs):
+    """
+    Keeps the stored minimum values and the search index entry of the parent offer in sync.
+    Skipped when the detail is removed as part of deleting the offer itself, and inside
+    suppress_offer_detail_sync() where the caller syncs the offer once at the end.
+    """
+    if isinstance(kwargs.get('origin'), Offer) or _offer_detail_sync_suppressed.get():
+        return
+    instance.offer.sync_from_details()
+
+@contextmanager
+def suppress_offer_detail_sync():
+    """
+    Skips the per-row offer sync for detail saves and deletes inside the block.
+    The caller is responsible for calling Offer.sync_from_details() afterwards.
+    """
+    token = _offer_detail_sync_suppressed.set(True)
+    try:
+        yield
+    finally:
+        _offer_detail_sync_suppressed.reset(token)
+
+@receiver(post_save, sender=Offer)
+def update_offer_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    search.index_offer(instance)
+
+@receiver(post_save, sender=Offer)
+def schedule_offer_image_derivatives(sender, instance, **kwargs):
+    images.schedule_derivatives(instance, 'image', 'image_variants')
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_from_search_index(sender, instance, **kwargs):
+    search.remove_offer(instance.pk)
+
+@receiver([post_save, post_delete], sender=Offer)
+@receiver([post_save, post_delete], sender=OfferDetail)
+@receiver(post_save, sender=Profile)
+def invalidate_offer_list_cache(sender, instance, created=False, **kwargs):
+    """
+    Bumps the offers generation once the write is committed, so no request can cache (or validate
+    an ETag for) the old rows under the new generation. Profiles only matter through the offers
+    they show up in, so a new profile (every signup) or one without offers leaves the cache alone.
+    """
+    if sender is Profile and (created or not Offer.objects.filter(user_id=instance.user_id).exists()):
+        return
+    transaction.on_commit(cache.bump_offers_generation)
+
+# Content-addressed file fields whose StoredBlob reference counts follow the rows.
+BLOB_FIELDS = {
+    Profile: ('file',),
+    FileUpload: ('file',),
+    Offer: ('image',),
+}
+
+@receiver(post_init, sender=Profile)
+@receiver(post_init, sender=FileUpload)
+@receiver(post_init, sender=Offer)
+def remember_blob_names(sender, instance, **kwargs):
+    instance._blob_names = {
+        field_name: instance.__dict__[field_name]
+        for field_name in BLOB_FIELDS[sender]
+        if field_name in instance.__dict__
+    }
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=FileUpload)
+@receiver(post_save, sender=Offer)
+def update_blob_references(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Moves a reference from the previous file to the new one when a file field changes.
+    Fields that were deferred when the row was loaded are left to the collect_orphaned_media recount.
+    """
+    previous = instance._blob_names
+    for field_name in BLOB_FIELDS[sender]:
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        if not created and field_name not in previous:
+            continue
+        old = '' if created else str(previous[field_name] or '')
+        new = getattr(instance, field_name).name or ''
+        if old != new:
+            StoredBlob.retain(new)
+            StoredBlob.release(old)
+        previous[field_name] = new
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=FileUpload)
+@receiver(post_delete, sender=Offer)
+def release_blob_references(sender, instance, **kwargs):
+    for field_name in BLOB_FIELDS[sender]:
+        StoredBlob.release(getattr(instance, field_name).name or '')
+
+class SearchDocumentField(models.TextField):
+    """
+    Hidden FTS5 column named after its table, only used as the left side of MATCH.
+    """
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+class OfferSearchIndex(models.Model):
+    """
+    Read-only view of the FTS5 table mirroring offer titles, descriptions and detail texts.
+    Rows are written by coderr_app.search; rank is the bm25 score of the current MATCH.
+    """
+    offer = models.OneToOneField(Offer, primary_key=True, db_column='rowid', db_constraint=False, on_delete=models.DO_NOTHING, related_name='search_index')
+    title = models.TextField()
+    description = models.TextField()
+    details = models.TextField()
+    document = SearchDocumentField(db_column=search.OFFER_SEARCH_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = search.OFFER_SEARCH_TABLE
+
 class Order(models.Model):
     STATUS_CHOICES = [
         ('in_progress', 'In Progress'),
@@ -99,9 +360,201 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_inbox_idx'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='order_customer_inbox_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.id} - {self.title}"
     
+class ArchivedOrder(models.Model):
+    """
+    A completed or cancelled order moved out of the live orders table by the archive_orders command.
+    The columns mirror Order in the same order, so both tables can be combined with UNION;
+    offer_detail is kept as a plain reference because the offer detail may be deleted later.
+    """
+    ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_customer_orders')
+    business_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_business_orders')
+    offer_detail = models.ForeignKey(OfferDetail, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+')
+    title = models.CharField(max_length=255)
+    revisions = models.IntegerField()
+    delivery_time_in_days = models.IntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField()
+    offer_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at'], name='archived_business_inbox_idx'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='archived_customer_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order {self.id} - {self.title}"
+
+    @classmethod
+    def archive_batch(cls, closed_before, batch_size=500):
+        """
+        Moves up to batch_size orders closed before the given time into the archive, oldest ids first.
+        Copy and delete run in one transaction, so an interrupted run can simply be started again.
+        Returns the number of archived orders.
+        """
+        fields = [field.attname for field in Order._meta.concrete_fields]
+        with transaction.atomic():
+            rows = list(
+                Order.objects.select_for_update()
+                .filter(status__in=cls.ARCHIVABLE_STATUSES, updated_at__lt=closed_before)
+                .order_by('id')
+                .values(*fields)[:batch_size]
+            )
+            if not rows:
+                return 0
+            cls.objects.bulk_create([cls(**row) for row in rows], ignore_conflicts=True)
+            with suppress_order_counter_sync():
+                Order.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        return len(rows)
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of a POST sent with an Idempotency-Key header.
+    A retry with the same key and body gets the stored response instead of creating a duplicate.
+    response_status stays empty while the first request is still running.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    path = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'path', 'key'], name='unique_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} of user {self.user_id}"
+
+class BusinessOrderCounter(models.Model):
+    """
+    Materialized order counts per business user and status.
+    Kept up to date in the same transaction as order writes by the Order post_save and post_delete
+    receivers (bulk paths call adjust themselves), so count lookups read one row.
+    """
+    STATUS_FIELDS = ('in_progress', 'completed', 'cancelled')
+
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='order_counter'
+    )
+    in_progress = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Order counts of user {self.business_user_id}"
+
+    @classmethod
+    def adjust(cls, changes):
+        """
+        Applies count changes given as {business_user_id: {status: delta}} with one UPDATE per business user.
+        Must run inside the transaction that changes the orders. Rows are only created for increments,
+        so decrements during a cascading user delete never recreate a deleted counter.
+        """
+        changes = {
+            user_id: {status: delta for status, delta in deltas.items() if delta and status in cls.STATUS_FIELDS}
+            for user_id, deltas in changes.items()
+        }
+        changes = {user_id: deltas for user_id, deltas in changes.items() if deltas}
+        if not changes:
+            return
+        new_rows = [cls(business_user_id=user_id) for user_id, deltas in changes.items() if max(deltas.values()) > 0]
+        if new_rows:
+            cls.objects.bulk_create(new_rows, ignore_conflicts=True)
+        now = timezone.now()
+        for user_id, deltas in changes.items():
+            cls.objects.filter(pk=user_id).update(
+                updated_at=now,
+                **{status: Greatest(F(status) + delta, 0) for status, delta in deltas.items()},
+            )
+
+    @classmethod
+    def record_status_change(cls, business_user_id, old_status, new_status):
+        """
+        Counts a new order (old_status None) or moves one order between statuses.
+        """
+        if old_status == new_status:
+            return
+        deltas = {new_status: 1}
+        if old_status:
+            deltas[old_status] = -1
+        cls.adjust({business_user_id: deltas})
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recomputes every counter from the live and archived orders. Returns the number of counter rows.
+        """
+        counters = {}
+        for model in (Order, ArchivedOrder):
+            rows = model.objects.order_by().values('business_user_id', 'status').annotate(total=models.Count('pk'))
+            for row in rows:
+                counter = counters.setdefault(row['business_user_id'], cls(business_user_id=row['business_user_id']))
+                if row['status'] in cls.STATUS_FIELDS:
+                    setattr(counter, row['status'], getattr(counter, row['status']) + row['total'])
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(counters.values(), batch_size=500)
+        return len(counters)
+
+@receiver(post_init, sender=Order)
+def remember_order_status(sender, instance, **kwargs):
+    instance._loaded_status = instance.__dict__.get('status')
+
+@receiver(post_save, sender=Order)
+def sync_order_change(sender, instance, created, **kwargs):
+    """
+    Counts new orders and status changes in the business order counters and pushes
+    order.created and order.status_changed events to the order's customer and business user.
+    """
+    old_status = None if created else instance._loaded_status
+    # A status loaded as a deferred field is unknown, so such a save is not counted.
+    if (created or old_status) and not _order_counter_sync_suppressed.get():
+        BusinessOrderCounter.record_status_change(instance.business_user_id, old_status, instance.status)
+    if created:
+        events.publish_order_events('order.created', [instance])
+    elif instance.status != old_status:
+        events.publish_order_events('order.status_changed', [instance])
+    instance._loaded_status = instance.status
+
+@receiver(post_delete, sender=Order)
+def decrement_order_counter(sender, instance, **kwargs):
+    if _order_counter_sync_suppressed.get():
+        return
+    BusinessOrderCounter.adjust({instance.business_user_id: {instance._loaded_status or instance.status: -1}})
+
+@contextmanager
+def suppress_order_counter_sync():
+    """
+    Keeps order saves and deletes inside the block out of the business order counters,
+    e.g. while orders are moved to the archive and should still be counted, or when
+    a bulk path applies one BusinessOrderCounter.adjust for all of its orders.
+    """
+    token = _order_counter_sync_suppressed.set(True)
+    try:
+        yield
+    finally:
+        _order_counter_sync_suppressed.reset(token)
+
 class Review(models.Model):
     business_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews_received')
     reviewer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews_given')
@@ -112,5 +565,155 @@ class Review(models.Model):
 
     class Meta:
         unique_together = ('business_user', 'reviewer')  
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"Review by {self.reviewer.username} for {self.business_user.username}"
+
+class BusinessRating(models.Model):
+    """
+    Materialized review statistics per business user: count, sum and a 1-5 star histogram.
+    Maintained by the Review post_save and post_delete receivers in the same transaction as every
+    review write, so ratings can be read with a join.
+    """
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='rating_summary'
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNTER_FIELDS = ('review_count', 'rating_sum', 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5')
+
     def __str__(self):
-        return f"Review by {self.reviewer.username} for {self.business_user.username}"
\ No newline at end of file
+        return f"Rating of user {self.business_user_id}: {self.average_rating} ({self.review_count} reviews)"
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.review_count, 1) if self.review_count else 0
+
+    @classmethod
+    def summary_for(cls, user):
+        """
+        Returns {'rating', 'review_count'} for a user. Loaded with select_related('rating_summary')
+        (or 'user__rating_summary'), this reads no extra rows; users without reviews get zeros.
+        """
+        try:
+            summary = user.rating_summary
+        except cls.DoesNotExist:
+            summary = None
+        if summary is None:
+            return {'rating': 0, 'review_count': 0}
+        return {'rating': summary.average_rating, 'review_count': summary.review_count}
+
+    @property
+    def histogram(self):
+        return {str(stars): getattr(self, f'stars_{stars}') for stars in range(1, 6)}
+
+    @classmethod
+    def record_change(cls, business_user_id, old_rating=None, new_rating=None):
+        """
+        Applies one review change: old_rating None for a new review, new_rating None for a deleted one.
+        Also touches the business profile, so profile and offer validators and caches move with the rating.
+        Must run inside the transaction that writes the review.
+        """
+        if old_rating == new_rating:
+            return
+        deltas = {}
+        if old_rating is not None:
+            deltas.update({'review_count': -1, 'rating_sum': -old_rating, f'stars_{old_rating}': -1})
+        if new_rating is not None:
+            deltas['review_count'] = deltas.get('review_count', 0) + 1
+            deltas['rating_sum'] = deltas.get('rating_sum', 0) + new_rating
+            deltas[f'stars_{new_rating}'] = deltas.get(f'stars_{new_rating}', 0) + 1
+        if old_rating is None:
+            cls.objects.bulk_create([cls(business_user_id=business_user_id)], ignore_conflicts=True)
+        now = timezone.now()
+        cls.objects.filter(pk=business_user_id).update(
+            updated_at=now,
+            **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items() if delta},
+        )
+        Profile.objects.filter(user_id=business_user_id).update(updated_at=now)
+        transaction.on_commit(cache.bump_offers_generation)
+
+    @classmethod
+    def compute(cls):
+        """
+        Computes the statistics of every business user from the reviews table.
+        Returns {business_user_id: BusinessRating} (unsaved).
+        """
+        ratings = {}
+        rows = Review.objects.order_by().values('business_user_id', 'rating').annotate(total=models.Count('pk'))
+        for row in rows:
+            rating = ratings.setdefault(row['business_user_id'], cls(business_user_id=row['business_user_id']))
+            rating.review_count += row['total']
+            rating.rating_sum += row['rating'] * row['total']
+            field = f"stars_{row['rating']}"
+            setattr(rating, field, getattr(rating, field) + row['total'])
+        return ratings
+
+    @classmethod
+    def find_mismatches(cls):
+        """
+        Compares the stored statistics with the reviews table. Returns the ids of business users that differ.
+        """
+        expected = cls.compute()
+        stored = {rating.pk: rating for rating in cls.objects.all()}
+        mismatches = []
+        for user_id in sorted(set(expected) | set(stored)):
+            current, wanted = stored.get(user_id), expected.get(user_id, cls(business_user_id=user_id))
+            values = [getattr(current, field) if current else 0 for field in cls.COUNTER_FIELDS]
+            if values != [getattr(wanted, field) for field in cls.COUNTER_FIELDS]:
+                mismatches.append(user_id)
+        return mismatches
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Replaces the stored statistics with freshly computed ones. Returns the number of rows.
+        """
+        ratings = cls.compute()
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(ratings.values(), batch_size=500)
+        cache.bump_offers_generation()
+        return len(ratings)
+
+@receiver(post_init, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    instance._loaded_rating = instance.__dict__.get('rating')
+    instance._loaded_business_user_id = instance.__dict__.get('business_user_id')
+
+@receiver(post_save, sender=Review)
+def apply_review_to_rating(sender, instance, created, **kwargs):
+    """
+    Adds new reviews to the business rating statistics and moves changed ratings,
+    comparing against the values the review was loaded with.
+    """
+    if created:
+        BusinessRating.record_change(instance.business_user_id, new_rating=instance.rating)
+    elif instance._loaded_rating is None:
+        return  # loaded with the rating deferred, so the change is unknown
+    elif instance.business_user_id != instance._loaded_business_user_id:
+        BusinessRating.record_change(instance._loaded_business_user_id, old_rating=instance._loaded_rating)
+        BusinessRating.record_change(instance.business_user_id, new_rating=instance.rating)
+    else:
+        BusinessRating.record_change(instance.business_user_id, old_rating=instance._loaded_rating, new_rating=instance.rating)
+    instance._loaded_rating = instance.rating
+    instance._loaded_business_user_id = instance.business_user_id
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_rating(sender, instance, **kwargs):
+    BusinessRating.record_change(
+        instance._loaded_business_user_id or instance.business_user_id,
+        old_rating=instance._loaded_rating or instance.rating,
+    )
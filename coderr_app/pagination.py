@@ -0,0 +1,265 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import F, Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Cursor (keyset) pagination over a compound sort key.
+    Pages are selected with a WHERE clause on the last seen key instead of an OFFSET,
+    and no COUNT query is run, so every page costs the same no matter how deep it is.
+    The last ordering field must be unique (usually 'id').
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    mode_query_value = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    # Sequence of (field_name, descending) tuples.
+    ordering = (('id', False),)
+
+    @classmethod
+    def is_requested(cls, request):
+        """
+        Checks if the client opted into cursor pagination.
+        Either the mode parameter or an existing cursor selects this paginator.
+        """
+        params = request.query_params
+        return params.get(cls.mode_query_param) == cls.mode_query_value or cls.cursor_query_param in params
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Returns the sort key used for the keyset, as (field_name, descending) tuples.
+        Subclasses can override this to follow the requested ordering.
+        """
+        return self.ordering
+
+    def get_page_size(self, request):
+        """
+        Returns the page size, honouring the page_size query parameter up to max_page_size.
+        """
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns one page of objects positioned after (or before) the decoded cursor.
+        Fetches one extra row to find out whether a further page exists.
+        """
+        position, reverse, ordering = self._start(queryset, request, view)
+        results = list(self._page_queryset(queryset, ordering, position)[:self.page_size + 1])
+        return self._finish(results, position, reverse)
+
+    def paginate_union(self, querysets, request, view=None):
+        """
+        Paginates the UNION of several querysets with the same columns (and usually the same model).
+        Each branch is keyset-limited on its own, so every branch can be served by its own index
+        range scan, and only the few candidate rows are merged and sorted.
+        """
+        position, reverse, ordering = self._start(querysets[0], request, view)
+        limit = self.page_size + 1
+        branches = [
+            queryset.model._default_manager.filter(
+                pk__in=self._page_queryset(queryset, ordering, position).values('pk')[:limit]
+            )
+            for queryset in querysets
+        ]
+        combined = branches[0].union(*branches[1:]) if len(branches) > 1 else branches[0]
+        results = list(combined.order_by(*[self._order_expression(*key) for key in ordering])[:limit])
+        return self._finish(results, position, reverse)
+
+    def _start(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering_fields = tuple(self.get_ordering(request, queryset, view))
+        self.nullable = {
+            name: queryset.model._meta.get_field(name).null for name, descending in self.ordering_fields
+        }
+        position, reverse = self.decode_cursor(request, queryset.model)
+        return position, reverse, self._effective_ordering(reverse)
+
+    def _page_queryset(self, queryset, ordering, position):
+        queryset = queryset.order_by(*[self._order_expression(*key) for key in ordering])
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+        return queryset
+
+    def _finish(self, results, position, reverse):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """
+        Returns the paginated response with opaque next and previous links and no count.
+        """
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._build_link(self.page[0], reverse=True)
+
+    def decode_cursor(self, request, model):
+        """
+        Decodes the cursor query parameter into key values and a direction flag.
+        Returns (None, False) for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            raw_values = payload['v']
+            if len(raw_values) != len(self.ordering_fields):
+                raise ValueError
+            values = [
+                None if raw is None else model._meta.get_field(name).to_python(raw)
+                for (name, descending), raw in zip(self.ordering_fields, raw_values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return values, bool(payload.get('r'))
+
+    def encode_cursor(self, obj, reverse):
+        """
+        Encodes the sort key of an object into an opaque cursor string.
+        """
+        values = []
+        for name, descending in self.ordering_fields:
+            value = getattr(obj, name)
+            if value is not None and not isinstance(value, (int, float, str)):
+                value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            values.append(value)
+        payload = {'v': values}
+        if reverse:
+            payload['r'] = 1
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+    def _build_link(self, obj, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    def _effective_ordering(self, reverse):
+        """
+        Returns (field_name, descending, nulls_last) tuples for the scan direction.
+        NULLs always sort after every value when paging forward.
+        """
+        if reverse:
+            return [(name, not descending, False) for name, descending in self.ordering_fields]
+        return [(name, descending, True) for name, descending in self.ordering_fields]
+
+    def _order_expression(self, name, descending, nulls_last):
+        """
+        Returns the ORDER BY expression for a key field. NULL placement is only spelled out
+        for nullable fields; on the others it would keep the database from reading an index in order.
+        """
+        expression = F(name).desc if descending else F(name).asc
+        if not self.nullable[name]:
+            return expression()
+        return expression(nulls_last=True) if nulls_last else expression(nulls_first=True)
+
+    def _after(self, ordering, position):
+        """
+        Builds the lexicographic "comes after position" condition for the given ordering.
+        """
+        condition = None
+        equal_so_far = Q()
+        for (name, descending, nulls_last), value in zip(ordering, position):
+            if value is None:
+                after = None if nulls_last else Q(**{f'{name}__isnull': False})
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if nulls_last and self.nullable[name]:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+            if after is not None:
+                step = equal_so_far & after
+                condition = step if condition is None else condition | step
+            equal_so_far &= equal
+        return condition if condition is not None else Q(pk__in=[])
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination shared by the list views (?page= and ?page_size=).
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class OptInPaginationMixin:
+    """
+    View mixin that picks the paginator per request: cursor_pagination_class when the client asks
+    for cursor pagination, pagination_class when it sends ?page= or ?page_size=, and None otherwise,
+    so existing clients keep getting the full list. Views that always paged set paginate_by_default.
+    max_page_size, when set, overrides the limit of both paginators.
+    """
+    pagination_class = PageNumberPagination
+    cursor_pagination_class = None
+    paginate_by_default = False
+    max_page_size = None
+
+    def uses_cursor_pagination(self):
+        return self.cursor_pagination_class is not None and self.cursor_pagination_class.is_requested(self.request)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if self.uses_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            elif self.paginate_by_default or 'page' in params or 'page_size' in params:
+                self._paginator = self.pagination_class()
+            else:
+                self._paginator = None
+            if self._paginator is not None and self.max_page_size is not None:
+                self._paginator.max_page_size = self.max_page_size
+        return self._paginator
@@ -0,0 +1,90 @@
+import logging
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Only read requests are held to a view's budget.
+BUDGETED_METHODS = ('GET', 'HEAD')
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when a view runs more database queries than its query_budget allows.
+    """
+
+
+class QueryCounter:
+    """
+    Counts the queries executed on the default database connection.
+    Used as a context manager and works without DEBUG.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+
+
+def get_query_budget(view):
+    """
+    Returns the query_budget declared on a view class (or the function returned by as_view()).
+    Views set query_budget to the maximum number of queries a read request may run,
+    independent of the page size. Returns None if the view declares no budget.
+    """
+    view_class = getattr(view, 'view_class', view)
+    return getattr(view_class, 'query_budget', None)
+
+
+def get_budget_violation(view, counter):
+    """
+    Returns a description of the overrun if the counted queries exceed the view's budget, otherwise None.
+    """
+    budget = get_query_budget(view)
+    if budget is None or counter.count <= budget:
+        return None
+    view_class = getattr(view, 'view_class', view)
+    return (
+        f"{view_class.__name__} ran {counter.count} queries, budget is {budget}:\n"
+        + '\n'.join(counter.queries)
+    )
+
+
+class QueryBudgetTestMixin:
+    """
+    Test case mixin that fails a test when a request exceeds the budget of the view under test.
+
+        with self.assertQueryBudget(OfferListView):
+            self.client.get('/api/offers/?page_size=100')
+    """
+
+    def assertQueryBudget(self, view):
+        return _QueryBudgetAssertion(self, view)
+
+
+class _QueryBudgetAssertion(QueryCounter):
+    def __init__(self, test_case, view):
+        super().__init__()
+        self.test_case = test_case
+        self.view = view
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            violation = get_budget_violation(self.view, self)
+            if violation:
+                self.test_case.fail(violation)
@@ -0,0 +1,105 @@
+import re
+
+from django.db import connection
+
+OFFER_SEARCH_TABLE = 'coderr_app_offer_fts'
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available():
+    """
+    Checks if the FTS5 offer index can be used on the current database.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(terms):
+    """
+    Turns raw search terms into a safe FTS5 MATCH expression.
+    Every word becomes a quoted prefix query and all words must match.
+    """
+    tokens = [token for term in terms for token in TOKEN_PATTERN.findall(term)]
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def get_details_text(details):
+    """
+    Builds the searchable text for a set of offer details from their titles and features.
+    """
+    parts = []
+    for detail in details:
+        parts.append(detail.title or '')
+        features = detail.features if isinstance(detail.features, list) else []
+        parts.extend(str(feature) for feature in features)
+    return ' '.join(part for part in parts if part)
+
+
+def get_index_row(offer):
+    return (offer.pk, offer.title, offer.description, get_details_text(offer.details.all()))
+
+
+def index_offer(offer):
+    """
+    Replaces the index entry of a single offer.
+    """
+    if not is_available():
+        return
+    row = get_index_row(offer)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {OFFER_SEARCH_TABLE} WHERE rowid = %s', [offer.pk])
+        cursor.execute(
+            f'INSERT INTO {OFFER_SEARCH_TABLE} (rowid, title, description, details) VALUES (%s, %s, %s, %s)',
+            row,
+        )
+
+
+def add_offers(entries):
+    """
+    Indexes newly created offers given as (offer, details) pairs, without reading the details back.
+    """
+    if not is_available():
+        return
+    rows = [(offer.pk, offer.title, offer.description, get_details_text(details)) for offer, details in entries]
+    with connection.cursor() as cursor:
+        _insert_rows(cursor, rows)
+
+
+def remove_offer(offer_id):
+    """
+    Removes a deleted offer from the index.
+    """
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {OFFER_SEARCH_TABLE} WHERE rowid = %s', [offer_id])
+
+
+def rebuild_index(offers, batch_size=500):
+    """
+    Drops every index entry and re-indexes the given offers in batches.
+    Returns the number of indexed offers.
+    """
+    if not is_available():
+        return 0
+    indexed = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {OFFER_SEARCH_TABLE}')
+        batch = []
+        for offer in offers.prefetch_related('details').iterator(chunk_size=batch_size):
+            batch.append(get_index_row(offer))
+            if len(batch) >= batch_size:
+                indexed += _insert_rows(cursor, batch)
+                batch = []
+        indexed += _insert_rows(cursor, batch)
+        cursor.execute(f"INSERT INTO {OFFER_SEARCH_TABLE} ({OFFER_SEARCH_TABLE}) VALUES ('optimize')")
+    return indexed
+
+
+def _insert_rows(cursor, rows):
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO {OFFER_SEARCH_TABLE} (rowid, title, description, details) VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+    return len(rows)
@@ -1,7 +1,17 @@
 from rest_framework import serializers
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from ...models import Offer, OfferDetail, Profile
+from django.db.models import Count
+from ... import cache, images
+from ...models import (
+    BusinessOrderCounter,
+    BusinessRating,
+    Offer,
+    OfferDetail,
+    Order,
+    suppress_offer_detail_sync,
+    suppress_order_counter_sync,
+)
 
 class OfferDetailBriefSerializer(serializers.ModelSerializer):
     """
@@ -57,24 +67,35 @@ class OfferSerializer(serializers.ModelSerializer):
     min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     min_delivery_time = serializers.IntegerField(read_only=True)
     image = serializers.ImageField(required=False, allow_null=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'details_data', 'min_price', 'min_delivery_time', 'user_details']
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'details_data', 'min_price', 'min_delivery_time', 'user_details']
         read_only_fields = ('created_at', 'updated_at', 'user')
 
     def get_user_details(self, obj):
         """
         Retrieves user details for the offer.
-        Returns first name, last name, and username of the user who created the offer.
+        Returns first name, last name, username and rating statistics of the user who created the offer.
+        Reads through obj.user.profile and obj.user.rating_summary so views can load them with select_related.
         """
-        profile = Profile.objects.get(user=obj.user)
+        user = obj.user
+        profile = user.profile
         return {
             "first_name": profile.first_name,
             "last_name": profile.last_name,
-            "username": profile.user.username,
+            "username": user.username,
+            **BusinessRating.summary_for(user),
         }
 
+    def get_image_variants(self, obj):
+        """
+        Returns the URLs of the generated thumbnail and card images in WebP and JPEG.
+        Empty until the background job has processed the current image.
+        """
+        return images.variant_urls(obj.image_variants, self.context.get('request'))
+
     def create(self, validated_data):
         """
         Creates a new offer.
@@ -83,11 +104,6 @@ class OfferSerializer(serializers.ModelSerializer):
         details_data = validated_data.pop('details')  # Use the correct source
         offer = Offer.objects.create(user=self.context['request'].user, **validated_data)
         for detail_data in details_data:
-            if 'delivery_time_in_days' not in detail_data or detail_data['delivery_time_in_days'] is None:
-                raise serializers.ValidationError("Delivery time (in days) is required for each offer detail.")
-            if not isinstance(detail_data['delivery_time_in_days'], int) or detail_data['delivery_time_in_days'] <= 0:
-                 raise serializers.ValidationError("Delivery time (in days) must be a positive integer.")
-
             OfferDetail.objects.create(offer=offer, **detail_data)
         return offer
 
@@ -108,8 +124,22 @@ class OfferSerializer(serializers.ModelSerializer):
         if len(offer_types) != len(set(offer_types)):
             raise serializers.ValidationError("Duplicate offer types are not allowed.")
 
+        if self.instance is None:
+            self.validate_new_details(details_data)
+
         return data
 
+    def validate_new_details(self, details_data):
+        """
+        Validates the details of a new offer.
+        Every detail needs a positive delivery time; checked before anything is written.
+        """
+        for detail_data in details_data:
+            if 'delivery_time_in_days' not in detail_data or detail_data['delivery_time_in_days'] is None:
+                raise serializers.ValidationError("Delivery time (in days) is required for each offer detail.")
+            if not isinstance(detail_data['delivery_time_in_days'], int) or detail_data['delivery_time_in_days'] <= 0:
+                raise serializers.ValidationError("Delivery time (in days) must be a positive integer.")
+
     def update(self, instance, validated_data):
         """
         Updates an existing offer.
@@ -123,39 +153,10 @@ class OfferSerializer(serializers.ModelSerializer):
         instance.save()
 
         if details_data is not None:
-            self.update_details(instance, details_data)
+            sync_offer_details(instance, details_data)
 
         return instance
 
-    def update_details(self, offer, details_data):
-        """
-        Updates offer details for an offer.
-        Handles updating, creating, and deleting offer details associated with an offer.
-        """
-        existing_details = {detail.id: detail for detail in offer.details.all()}
-        updated_detail_ids = []
-
-        with transaction.atomic():
-            for detail_data in details_data:
-                detail_id = detail_data.get('id')
-
-                if detail_id:
-                    detail = existing_details.get(detail_id)
-                    if detail:
-                        serializer = OfferDetailSerializer(detail, data=detail_data, partial=True)
-                        serializer.is_valid(raise_exception=True)
-                        serializer.save()
-                        updated_detail_ids.append(detail_id)
-
-                else:
-                    serializer = OfferDetailSerializer(data=detail_data)
-                    serializer.is_valid(raise_exception=True)
-                    serializer.save(offer=offer)
-
-            for detail_id, detail in existing_details.items():
-                if detail_id not in updated_detail_ids:
-                    detail.delete()
-
     def to_representation(self, instance):
         """
         Customizes the serialization to return min_price as a number (float).
@@ -163,4 +164,72 @@ class OfferSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         if representation.get('min_price') is not None:
             representation['min_price'] = int(float(representation['min_price']))
-        return representation
\ No newline at end of file
+        return representation
+
+
+def sync_offer_details(offer, details_data):
+    """
+    Applies a list of offer details to an offer as a diff.
+    Entries with a known id update that detail, entries without an id are created and
+    existing details missing from the list are deleted. Everything is validated up front,
+    then written with one bulk_update and one bulk_create in a single transaction, and the
+    offer is re-synced once. Orders of deleted details are deleted with them; they are
+    taken out of the business order counters with one adjust instead of one UPDATE per order.
+    """
+    existing_details = {detail.id: detail for detail in OfferDetail.objects.filter(offer=offer)}
+    kept_ids = set()
+    to_update = []
+    update_fields = set()
+    to_create = []
+
+    for detail_data in details_data:
+        detail_id = detail_data.get('id')
+        if detail_id:
+            detail = existing_details.get(detail_id)
+            if detail is None:
+                continue
+            kept_ids.add(detail_id)
+            serializer = OfferDetailSerializer(detail, data=detail_data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            changed = [
+                field for field, value in serializer.validated_data.items()
+                if field != 'id' and getattr(detail, field) != value
+            ]
+            for field in changed:
+                setattr(detail, field, serializer.validated_data[field])
+            if changed:
+                to_update.append(detail)
+                update_fields.update(changed)
+        else:
+            serializer = OfferDetailSerializer(data=detail_data)
+            serializer.is_valid(raise_exception=True)
+            values = {field: value for field, value in serializer.validated_data.items() if field != 'id'}
+            to_create.append(OfferDetail(offer=offer, **values))
+
+    delete_ids = [detail_id for detail_id in existing_details if detail_id not in kept_ids]
+    if not (to_update or to_create or delete_ids):
+        return
+
+    getattr(offer, '_prefetched_objects_cache', {}).pop('details', None)
+    with transaction.atomic(), suppress_offer_detail_sync():
+        if to_update:
+            OfferDetail.objects.bulk_update(to_update, sorted(update_fields))
+        if to_create:
+            OfferDetail.objects.bulk_create(to_create)
+        if delete_ids:
+            delete_offer_details(delete_ids)
+        offer.sync_from_details()
+    transaction.on_commit(cache.bump_offers_generation)
+
+
+def delete_offer_details(detail_ids):
+    """
+    Deletes offer details and their orders. Must run inside a transaction.
+    """
+    orders = Order.objects.filter(offer_detail_id__in=detail_ids)
+    changes = {}
+    for row in orders.order_by().values('business_user_id', 'status').annotate(count=Count('pk')):
+        changes.setdefault(row['business_user_id'], {})[row['status']] = -row['count']
+    with suppress_order_counter_sync():
+        OfferDetail.objects.filter(pk__in=detail_ids).delete()
+    BusinessOrderCounter.adjust(changes)
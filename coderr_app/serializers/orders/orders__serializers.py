@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from ...models import Order, OfferDetail, CustomUser
 
@@ -46,26 +48,26 @@ class OrderSerializer(serializers.ModelSerializer):
         Creates a new order.
         Creates an order based on a selected offer detail, associating it with the customer and business users.
         """
-        offer_detail_id = validated_data.pop('offer_detail_id')
-        offer_detail = get_object_or_404(OfferDetail, id=offer_detail_id)
-        offer = offer_detail.offer
-
         if self.context['request'].user.type != 'customer':
             raise serializers.ValidationError("Only customers can create orders.")
 
-        order = Order.objects.create(
-            customer_user=self.context['request'].user,
-            business_user=offer.user,
-            offer_detail=offer_detail,
-            title=offer.title,
-            revisions=offer_detail.revisions,
-            delivery_time_in_days=offer_detail.delivery_time_in_days,
-            price=offer_detail.price,
-            features=offer_detail.features,
-            offer_type=offer_detail.offer_type,
-            status='in_progress',
-        )
-        return order
+        offer_detail_id = validated_data.pop('offer_detail_id')
+        offer_detail = get_object_or_404(OfferDetail.objects.select_related('offer'), id=offer_detail_id)
+        offer = offer_detail.offer
+
+        with transaction.atomic():
+            return Order.objects.create(
+                customer_user=self.context['request'].user,
+                business_user_id=offer.user_id,
+                offer_detail=offer_detail,
+                title=offer.title,
+                revisions=offer_detail.revisions,
+                delivery_time_in_days=offer_detail.delivery_time_in_days,
+                price=offer_detail.price,
+                features=offer_detail.features,
+                offer_type=offer_detail.offer_type,
+                status='in_progress',
+            )
 
     def update(self, instance, validated_data):
         """
@@ -74,8 +76,9 @@ class OrderSerializer(serializers.ModelSerializer):
         """
         if self.context['request'].user.type == 'business':
             if 'status' in validated_data:
-                instance.status = validated_data['status']
-                instance.save()
+                with transaction.atomic():
+                    instance.status = validated_data['status']
+                    instance.save()
                 return instance
         else:
             raise serializers.ValidationError("Only business users can update the order status")
@@ -93,4 +96,32 @@ class CompletedOrderCountSerializer(serializers.Serializer):
     Serializer for completed order count.
     Used to return the count of completed orders.
     """
-    completed_order_count = serializers.IntegerField()
\ No newline at end of file
+    completed_order_count = serializers.IntegerField()
+
+class BusinessOrderCountsSerializer(serializers.Serializer):
+    """
+    Serializer for the order counts of one business user.
+    Used by the batch endpoint to return the counts of many business users at once.
+    """
+    business_user_id = serializers.IntegerField()
+    order_count = serializers.IntegerField()
+    completed_order_count = serializers.IntegerField()
+    cancelled_order_count = serializers.IntegerField()
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Serializer for bulk status changes.
+    Validates the list of order IDs and the target status.
+    """
+    order_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+    def validate_order_ids(self, value):
+        """
+        Removes duplicate IDs and enforces ORDER_BULK_STATUS_MAX_IDS.
+        """
+        max_ids = getattr(settings, 'ORDER_BULK_STATUS_MAX_IDS', 500)
+        value = list(dict.fromkeys(value))
+        if len(value) > max_ids:
+            raise serializers.ValidationError(f"At most {max_ids} orders can be updated per request.")
+        return value
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from rest_framework.authtoken.models import Token
-from ...models import Profile
+from ... import images
+from ...models import BusinessRating, Profile
 
 User = get_user_model()
 
@@ -13,11 +15,18 @@ class BaseProfileSerializer(serializers.ModelSerializer):
     """
     username = serializers.CharField(source='user.username', read_only=True)
     type = serializers.CharField(source='user.type', read_only=True)
+    file_variants = serializers.SerializerMethodField()
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'type']
         read_only_fields = ('user',)
 
+    def get_file_variants(self, obj):
+        """
+        Returns the URLs of the generated profile picture sizes in WebP and JPEG.
+        """
+        return images.variant_urls(obj.file_variants, self.context.get('request'))
+
 class CustomerProfileSerializer(BaseProfileSerializer):
     """
     Serializer for customer profiles.
@@ -28,10 +37,19 @@ class CustomerProfileSerializer(BaseProfileSerializer):
 class BusinessProfileSerializer(BaseProfileSerializer):
     """
     Serializer for business profiles.
-    Inherits from BaseProfileSerializer and adds business-specific fields.
+    Inherits from BaseProfileSerializer and adds business-specific fields and the rating statistics.
     """
+    rating = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+
     class Meta(BaseProfileSerializer.Meta):
-        fields = BaseProfileSerializer.Meta.fields + ['location', 'tel', 'description', 'working_hours']
+        fields = BaseProfileSerializer.Meta.fields + ['location', 'tel', 'description', 'working_hours', 'rating', 'review_count']
+
+    def get_rating(self, obj):
+        return BusinessRating.summary_for(obj.user)['rating']
+
+    def get_review_count(self, obj):
+        return BusinessRating.summary_for(obj.user)['review_count']
 
 class ProfileSerializer(serializers.ModelSerializer):
     """
@@ -41,13 +59,31 @@ class ProfileSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', required=False)
     email = serializers.EmailField(source='user.email', required=False)
     type = serializers.CharField(source='user.type', required=False)
+    file_variants = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel',
-                  'description', 'working_hours', 'type', 'email', 'created_at']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel',
+                  'description', 'working_hours', 'type', 'email', 'created_at', 'rating', 'review_count']
         read_only_fields = ('user', 'created_at')
 
+    def get_rating(self, obj):
+        """
+        Returns the average review rating from the materialized statistics (0 without reviews).
+        """
+        return BusinessRating.summary_for(obj.user)['rating']
+
+    def get_review_count(self, obj):
+        return BusinessRating.summary_for(obj.user)['review_count']
+
+    def get_file_variants(self, obj):
+        """
+        Returns the URLs of the generated profile picture sizes in WebP and JPEG.
+        """
+        return images.variant_urls(obj.file_variants, self.context.get('request'))
+
     def update(self, instance, validated_data):
         """
         Updates the profile instance.
@@ -91,17 +127,17 @@ class UserRegistrationSerializer(serializers.Serializer):
     def create(self, validated_data):
         """
         Creates a new user.
-        Creates a new user instance, sets the user type, and generates an authentication token.
+        Inserts the user with its type, its profile (post_save signal) and its authentication token
+        in one transaction: three writes and no follow-up saves.
         """
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password']
-        )
-        user.type = validated_data['type']
-        user.save()
-
-        token, created = Token.objects.get_or_create(user=user)
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=validated_data['username'],
+                email=validated_data['email'],
+                password=validated_data['password'],
+                type=validated_data['type'],
+            )
+            token = Token.objects.create(user=user)
         validated_data['token'] = token.key
         validated_data['user_id'] = user.id
 
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db import transaction
 from ...models import Review, CustomUser
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -28,12 +29,20 @@ class ReviewSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("You have already submitted a review for this business.")
         return data
 
+    def create(self, validated_data):
+        """
+        Creates a review; the Review signals add it to the business user's rating statistics in the same transaction.
+        """
+        with transaction.atomic():
+            return super().create(validated_data)
+
     def update(self, instance, validated_data):
         """
         Updates an existing review.
-        Allows updating the rating and description of a review.
+        Allows updating the rating and description of a review; the rating statistics follow in the same transaction.
         """
-        instance.rating = validated_data.get('rating', instance.rating)
-        instance.description = validated_data.get('description', instance.description)
-        instance.save()
+        with transaction.atomic():
+            instance.rating = validated_data.get('rating', instance.rating)
+            instance.description = validated_data.get('description', instance.description)
+            instance.save()
         return instance
\ No newline at end of file
@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from ..models import FileUpload
+from ..models import FileUpload, UploadSession
 
 class FileUploadSerializer(serializers.ModelSerializer):
     """
@@ -8,4 +9,29 @@ class FileUploadSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = FileUpload
-        fields = ['file', 'uploaded_at']
\ No newline at end of file
+        fields = ['file', 'uploaded_at']
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for resumable upload sessions.
+    Clients declare the file name and size up front and read back the current offset to resume.
+    """
+    checksum = serializers.RegexField(r'^[0-9a-fA-F]{64}$', source='expected_checksum', required=False, write_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'offset', 'checksum', 'created_at', 'updated_at']
+        read_only_fields = ('id', 'offset', 'created_at', 'updated_at')
+
+    def validate_size(self, value):
+        """
+        Validates the declared size against FILE_UPLOAD_MAX_SIZE.
+        """
+        max_size = getattr(settings, 'FILE_UPLOAD_MAX_SIZE', 2 * 1024 ** 3)
+        if value <= 0 or value > max_size:
+            raise serializers.ValidationError(f"Size must be between 1 and {max_size} bytes.")
+        return value
+
+    def validate_checksum(self, value):
+        return value.lower()
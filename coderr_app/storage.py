@@ -0,0 +1,150 @@
+import hashlib
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.db import transaction
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+_content_storage = None
+
+
+def get_blob_dir():
+    return getattr(settings, 'CONTENT_STORAGE_DIR', 'blobs')
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(get_blob_dir().rstrip('/') + '/')
+
+
+def is_content_addressed_name(name):
+    """
+    Checks if a storage name is a blob named after its own SHA-256 (blobs/aa/bb/<digest><ext>).
+    Such a file never changes; derivatives stored next to it (<digest>.thumb.webp) can.
+    """
+    pattern = r'%s/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[^./]*)?' % re.escape(get_blob_dir().rstrip('/'))
+    return bool(name) and re.fullmatch(pattern, name.replace(os.sep, '/')) is not None
+
+
+def hash_content(content):
+    """
+    Returns the SHA-256 hex digest of a file, reading it in chunks and rewinding it afterwards.
+    """
+    hasher = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its content
+    (e.g. blobs/3f/a2/3fa2...e1.png), so identical uploads share one file on disk.
+    The digest is taken from content.sha256 when an upload handler already computed it
+    while the request streamed in, and computed from the file otherwise.
+    """
+
+    def get_blob_name(self, digest, original_name):
+        extension = os.path.splitext(original_name or '')[1].lower()[:10]
+        return f'{get_blob_dir()}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = getattr(content, 'sha256', None) or hash_content(content)
+        return super().save(self.get_blob_name(digest, name), content, max_length=max_length)
+
+    def _save(self, name, content):
+        """
+        Registers the blob and locks its StoredBlob row before looking at the disk, so a concurrent
+        delete_unreferenced either finishes first (and the file is written again) or sees the save.
+        An existing file is touched instead of written; new blobs are written under a temporary
+        name and renamed into place, so concurrent saves of the same content never see a partial file.
+        """
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            StoredBlob.objects.get_or_create(
+                name=name, defaults={'sha256': os.path.splitext(os.path.basename(name))[0], 'size': content.size},
+            )
+            StoredBlob.objects.select_for_update().get(name=name)
+            if self.exists(name):
+                os.utime(self.path(name))
+                return name
+            temp_name = f'{name}.{uuid.uuid4().hex}.tmp'
+            temp_name = super()._save(temp_name, content)
+            os.replace(self.path(temp_name), self.path(name))
+        return name
+
+    def was_saved_recently(self, name):
+        """
+        Checks if the file was written or touched by a save within CONTENT_STORAGE_DELETE_GRACE seconds,
+        i.e. a row referring to it may be about to be committed.
+        """
+        grace = getattr(settings, 'CONTENT_STORAGE_DELETE_GRACE', 60)
+        try:
+            return os.path.getmtime(self.path(name)) > time.time() - grace
+        except FileNotFoundError:
+            return False
+
+
+def get_content_storage():
+    global _content_storage
+    if _content_storage is None:
+        _content_storage = ContentAddressedStorage()
+    return _content_storage
+
+
+class HashingMemoryFileUploadHandler(MemoryFileUploadHandler):
+    """
+    In-memory upload handler that hashes the file while it is received.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.activated:
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Temporary-file upload handler that hashes the file while it is written to disk.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hasher.hexdigest()
+        return file
@@ -0,0 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+
+def batch_text(lines, batch_size):
+    """
+    Joins an iterator of text lines into larger chunks, so a streamed response sends
+    one write per batch_size lines instead of one per line.
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+async def iterate_async(iterator):
+    """
+    Exposes a synchronous iterator (e.g. one reading from the database) as an async iterator.
+    Every chunk is produced on Django's sync thread, so the event loop never blocks on the query.
+    """
+    iterator = iter(iterator)
+    done = object()
+    while True:
+        chunk = await sync_to_async(next, thread_sensitive=True)(iterator, done)
+        if chunk is done:
+            break
+        yield chunk
+
+
+def stream_response(request, chunks, content_type, headers=None):
+    """
+    Returns a StreamingHttpResponse for the chunks. Under ASGI the chunks are wrapped in an
+    async iterator, because Django would otherwise read a sync iterator into memory first.
+    """
+    django_request = getattr(request, '_request', request)
+    if isinstance(django_request, ASGIRequest):
+        chunks = iterate_async(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type, headers=headers)
@@ -0,0 +1,96 @@
+import shutil
+import tempfile
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import CustomUser, Offer, OfferDetail, Order
+from ..query_budget import QueryBudgetTestMixin
+
+
+def create_user(username, type='customer', password='secret'):
+    return CustomUser.objects.create_user(username=username, email=f'{username}@example.com', password=password, type=type)
+
+
+def client_for(user):
+    """
+    Returns an API client authenticated with the user's token.
+    """
+    client = APIClient()
+    token, created = Token.objects.get_or_create(user=user)
+    client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+    return client
+
+
+def details_data(price=100, delivery_time=5):
+    """
+    Returns the basic, standard and premium details of an offer payload.
+    """
+    return [
+        {'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': delivery_time, 'price': price,
+         'features': ['Logo'], 'offer_type': 'basic'},
+        {'title': 'Standard', 'revisions': 2, 'delivery_time_in_days': delivery_time + 2, 'price': price * 2,
+         'features': ['Logo', 'Card'], 'offer_type': 'standard'},
+        {'title': 'Premium', 'revisions': 3, 'delivery_time_in_days': delivery_time + 4, 'price': price * 3,
+         'features': ['Logo', 'Card', 'Flyer'], 'offer_type': 'premium'},
+    ]
+
+
+def create_offer(user, title='Logo design', description='A new logo', price=100, delivery_time=5):
+    """
+    Creates an offer with three details through the ORM; the detail signals keep min_price and the search index in sync.
+    """
+    offer = Offer.objects.create(user=user, title=title, description=description)
+    for detail in details_data(price, delivery_time):
+        OfferDetail.objects.create(offer=offer, **detail)
+    offer.refresh_from_db()
+    return offer
+
+
+def create_order(customer, offer, offer_type='basic', status='in_progress'):
+    """
+    Creates an order for one detail of the offer through the ORM.
+    """
+    detail = offer.details.get(offer_type=offer_type)
+    return Order.objects.create(
+        customer_user=customer,
+        business_user=offer.user,
+        offer_detail=detail,
+        title=offer.title,
+        revisions=detail.revisions,
+        delivery_time_in_days=detail.delivery_time_in_days,
+        price=detail.price,
+        features=detail.features,
+        offer_type=detail.offer_type,
+        status=status,
+    )
+
+
+@override_settings(
+    IMAGE_DERIVATIVES_ASYNC=False,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class CoderrAPITestCase(QueryBudgetTestMixin, APITestCase):
+    """
+    Base test case: media is written to a temporary directory, the caches start empty
+    and passwords use a fast hasher.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._media_root = tempfile.mkdtemp()
+        cls._media_override = override_settings(MEDIA_ROOT=cls._media_root)
+        cls._media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._media_override.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+
+    def setUp(self):
+        for alias in ('default', 'offers'):
+            caches[alias].clear()
@@ -0,0 +1,89 @@
+import os
+import time
+from io import StringIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from ..models import FileUpload, StoredBlob
+from ..storage import get_content_storage
+from .base import CoderrAPITestCase
+
+
+def age_file(path, seconds=3600):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class StoredBlobTests(CoderrAPITestCase):
+    """
+    Blob reference counting: a blob is deleted with its last reference unless a save
+    reused it in the meantime, and the orphan sweep stays inside CONTENT_STORAGE_DIR.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.storage = get_content_storage()
+
+    def create_upload(self, data=b'blob content'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return FileUpload.objects.create(file=ContentFile(data, 'notes.txt'))
+
+    @override_settings(CONTENT_STORAGE_DELETE_GRACE=0)
+    def test_last_reference_deletes_blob(self):
+        upload = self.create_upload()
+        name = upload.file.name
+        self.assertEqual(StoredBlob.objects.get(name=name).ref_count, 1)
+        second = self.create_upload()
+        self.assertEqual(StoredBlob.objects.get(name=name).ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upload.delete()
+        self.assertTrue(self.storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
+
+    def test_save_during_pending_delete_keeps_file(self):
+        upload = self.create_upload()
+        name = upload.file.name
+        age_file(self.storage.path(name))
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            upload.delete()
+        self.assertEqual(StoredBlob.objects.get(name=name).ref_count, 0)
+
+        # The same content is saved again before the delete callback runs.
+        self.assertEqual(self.storage.save('again.txt', ContentFile(b'blob content')), name)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(self.storage.exists(name))
+
+        reused = self.create_upload()
+        self.assertEqual(reused.file.name, name)
+        self.assertEqual(StoredBlob.objects.get(name=name).ref_count, 1)
+
+    @override_settings(CONTENT_STORAGE_DELETE_GRACE=0)
+    def test_delete_rechecks_reference_count(self):
+        name = self.create_upload().file.name
+        StoredBlob.delete_unreferenced(name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(StoredBlob.objects.get(name=name).ref_count, 1)
+
+    def test_collect_orphaned_media_only_sweeps_blobs(self):
+        kept = self.create_upload(b'kept').file.name
+        orphan = self.storage.save('orphan.txt', ContentFile(b'orphan'))
+        other = os.path.join(settings.MEDIA_ROOT, 'offer_images', 'legacy.png')
+        os.makedirs(os.path.dirname(other), exist_ok=True)
+        open(other, 'wb').close()
+        for path in (self.storage.path(kept), self.storage.path(orphan), other):
+            age_file(path)
+
+        call_command('collect_orphaned_media', '--grace-minutes', '1', stdout=StringIO())
+
+        self.assertTrue(self.storage.exists(kept))
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertFalse(StoredBlob.objects.filter(name=orphan).exists())
+        self.assertTrue(os.path.exists(other))
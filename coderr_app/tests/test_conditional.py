@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .base import CoderrAPITestCase, client_for, create_offer, create_user
+
+
+class OfferListConditionalGetTests(CoderrAPITestCase):
+    """
+    The offer list ETag comes from the offers generation, so a 304 or a cache hit runs no query.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.offer = create_offer(self.business)
+        self.anonymous = APIClient()
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.anonymous.get('/api/offers/')['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.anonymous.get('/api/offers/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 0)
+
+    def test_cache_hit_runs_no_query(self):
+        self.anonymous.get('/api/offers/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.anonymous.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(queries), 0)
+
+    def test_etag_changes_with_writes_and_parameters(self):
+        etag = self.anonymous.get('/api/offers/')['ETag']
+        self.assertNotEqual(self.anonymous.get('/api/offers/', {'ordering': 'min_price'})['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.business.profile.save()
+        response = self.anonymous.get('/api/offers/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_authenticated_clients_get_304_too(self):
+        client = client_for(self.business)
+        etag = client.get('/api/offers/')['ETag']
+        self.assertEqual(client.get('/api/offers/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class ObjectConditionalGetTests(CoderrAPITestCase):
+    """
+    Single offers and profiles answer If-None-Match and If-Modified-Since with 304 until they change.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.offer = create_offer(self.business)
+        self.client = client_for(self.business)
+
+    def test_offer_detail_etag_and_last_modified(self):
+        response = self.client.get(f'/api/offers/{self.offer.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.get(f'/api/offers/{self.offer.id}/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+        self.assertEqual(
+            self.client.get(f'/api/offers/{self.offer.id}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code,
+            304,
+        )
+
+        detail = self.offer.details.get(offer_type='basic')
+        detail.price = 20
+        detail.save()
+        response = self.client.get(f'/api/offers/{self.offer.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_etag_moves_when_the_profile_changes(self):
+        url = f'/api/profile/{self.business.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.patch(url, {'location': 'Berlin'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['location'], 'Berlin')
+
+    def test_missing_profile_is_404(self):
+        self.assertEqual(self.client.get('/api/profile/999999/').status_code, 404)
@@ -0,0 +1,52 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ..models import IdempotencyKey, Order
+from .base import CoderrAPITestCase, client_for, create_offer, create_user
+
+
+class IdempotentOrderCreateTests(CoderrAPITestCase):
+    """
+    POST /api/orders/ with an Idempotency-Key replays the first response instead of creating
+    a second order, and expired keys are purged.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.customer = create_user('client')
+        self.client = client_for(self.customer)
+        offer = create_offer(create_user('studio', type='business'))
+        self.basic, self.premium = offer.details.get(offer_type='basic'), offer.details.get(offer_type='premium')
+
+    def post(self, detail, key):
+        return self.client.post('/api/orders/', {'offer_detail_id': detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self):
+        first = self.post(self.basic, 'order-1')
+        self.assertEqual(first.status_code, 201)
+        retry = self.post(self.basic, 'order-1')
+        self.assertEqual((retry.status_code, retry['Idempotent-Replayed']), (201, 'true'))
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(Order.objects.count(), 1)
+
+        self.assertEqual(self.post(self.premium, 'order-1').status_code, 422)
+        self.assertEqual(self.post(self.basic, 'order-2').status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_failed_request_releases_key(self):
+        response = self.client.post('/api/orders/', {'offer_detail_id': 'x'}, format='json', HTTP_IDEMPOTENCY_KEY='retry')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post(self.basic, 'retry').status_code, 201)
+
+    def test_purge_deletes_expired_keys(self):
+        self.post(self.basic, 'old')
+        self.post(self.basic, 'new')
+        IdempotencyKey.objects.filter(key='old').update(created_at=timezone.now() - timedelta(days=2))
+
+        call_command('purge_idempotency_keys', stdout=StringIO())
+
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['new'])
@@ -0,0 +1,68 @@
+from io import BytesIO, StringIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from ..models import Offer, Profile
+from .base import CoderrAPITestCase, client_for, create_offer, create_user
+
+
+def image_upload(name='picture.png', size=(800, 600), mode='RGBA'):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ImageDerivativeTests(CoderrAPITestCase):
+    """
+    Uploaded offer images and profile pictures get every configured size as WebP and JPEG.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.client = client_for(self.business)
+
+    def test_profile_picture_upload_creates_variants(self):
+        with self.settings(IMAGE_VARIANTS={'thumb': (100, 100), 'card': (300, 200)}):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    f'/api/profile/{self.business.id}/', {'file': image_upload()}, format='multipart'
+                )
+        self.assertEqual(response.status_code, 200, response.data)
+
+        profile = Profile.objects.get(user=self.business)
+        self.assertEqual(profile.file_variants['source'], profile.file.name)
+        for variant, size in (('thumb', (100, 100)), ('card', (300, 200))):
+            for extension, pillow_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+                with default_storage.open(profile.file_variants[variant][extension]) as stored:
+                    image = Image.open(stored)
+                    self.assertEqual((image.format, image.size), (pillow_format, size))
+
+        urls = self.client.get(f'/api/profile/{self.business.id}/').data['file_variants']
+        self.assertTrue(urls['thumb']['webp'].startswith('http://testserver/media/'))
+
+    def test_removing_the_image_clears_the_variants(self):
+        offer = create_offer(self.business)
+        offer.image = image_upload()
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.save()
+        self.assertIn('thumb', Offer.objects.get(pk=offer.pk).image_variants)
+
+        offer = Offer.objects.get(pk=offer.pk)
+        offer.image = None
+        offer.save()
+        self.assertEqual(Offer.objects.get(pk=offer.pk).image_variants, {})
+
+    def test_unreadable_images_are_skipped_and_the_command_backfills(self):
+        offer = create_offer(self.business)
+        offer.image = SimpleUploadedFile('broken.png', b'not an image', content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.save()
+        self.assertEqual(Offer.objects.get(pk=offer.pk).image_variants, {})
+
+        Offer.objects.filter(pk=offer.pk).update(image=default_storage.save('offer_images/ok.png', image_upload()))
+        call_command('generate_image_derivatives', '--only', 'offers', stdout=StringIO())
+        self.assertIn('card', Offer.objects.get(pk=offer.pk).image_variants)
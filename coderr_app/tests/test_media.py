@@ -0,0 +1,82 @@
+import hashlib
+import importlib
+import os
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.http import Http404
+from django.test import RequestFactory, override_settings
+from django.urls import Resolver404, clear_url_caches, resolve
+
+from coderr_backend.views import serve_media
+from .base import CoderrAPITestCase
+
+
+class MediaServingTests(CoderrAPITestCase):
+    """
+    serve_media answers ranges and validators, caches only content-addressed blobs as immutable
+    and never exposes upload sessions.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.content = bytes(range(256)) * 40
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.blob_name = f'blobs/{digest[:2]}/{digest[2:4]}/{digest}.bin'
+        self.derivative_name = f'blobs/{digest[:2]}/{digest[2:4]}/{digest}.thumb.webp'
+        for name in (self.blob_name, self.derivative_name, 'upload_sessions/abc.part'):
+            path = os.path.join(settings.MEDIA_ROOT, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as handle:
+                handle.write(self.content)
+        self.factory = RequestFactory()
+
+    def get(self, name, **headers):
+        response = async_to_sync(serve_media)(self.factory.get(f'/media/{name}', headers=headers), name)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_file_and_byte_range(self):
+        response, body = self.get(self.blob_name)
+        self.assertEqual((response.status_code, body), (200, self.content))
+        response, body = self.get(self.blob_name, Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(body, self.content[100:200])
+        response, body = self.get(self.blob_name, Range=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_etag_revalidation(self):
+        response, body = self.get(self.blob_name)
+        response, body = self.get(self.blob_name, If_None_Match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_only_content_addressed_blobs_are_immutable(self):
+        response, body = self.get(self.blob_name)
+        self.assertIn('immutable', response['Cache-Control'])
+        response, body = self.get(self.derivative_name)
+        self.assertEqual(response['Cache-Control'], settings.MEDIA_MUTABLE_CACHE_CONTROL)
+
+    def test_upload_sessions_and_paths_outside_media_are_not_served(self):
+        for name in ('upload_sessions/abc.part', 'upload_sessions', '../settings.py', 'missing.bin'):
+            with self.subTest(name=name):
+                with self.assertRaises(Http404):
+                    self.get(name)
+
+    def reload_urls(self):
+        clear_url_caches()
+        importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+
+    def test_route_needs_debug_serve_or_sendfile(self):
+        self.assertFalse(settings.DEBUG)
+        with self.assertRaises(Resolver404):
+            resolve(f'/media/{self.blob_name}')
+
+    def test_media_serve_enables_route(self):
+        self.addCleanup(self.reload_urls)
+        with override_settings(MEDIA_SERVE=True):
+            self.reload_urls()
+            self.assertEqual(resolve(f'/media/{self.blob_name}').func, serve_media)
+            response = self.client.get(f'/media/{self.blob_name}', HTTP_RANGE='bytes=0-9')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(b''.join(response.streaming_content), self.content[:10])
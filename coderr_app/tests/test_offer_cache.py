@@ -0,0 +1,61 @@
+from rest_framework.test import APIClient
+
+from .. import cache
+from .base import CoderrAPITestCase, client_for, create_offer, create_user
+
+
+class OfferListCacheTests(CoderrAPITestCase):
+    """
+    Anonymous offer lists are cached per normalized query and dropped by bumping the generation.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.offer = create_offer(self.business, title='Logo design')
+        self.anonymous = APIClient()
+
+    def test_repeat_request_is_a_hit(self):
+        first = self.anonymous.get('/api/offers/', {'page_size': 5, 'ordering': 'min_price'})
+        second = self.anonymous.get('/api/offers/', {'ordering': 'min_price', 'page_size': 5})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache.get_cache_stats()['hits'], 1)
+
+    def test_writes_invalidate_the_cache(self):
+        self.anonymous.get('/api/offers/')
+        self.offer.title = 'Logo redesign'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.save()
+        response = self.anonymous.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Logo redesign')
+
+        detail = self.offer.details.get(offer_type='basic')
+        detail.price = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            detail.save()
+        response = self.anonymous.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(float(response.data['results'][0]['min_price']), 10)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.anonymous.get('/api/offers/')
+        response = client_for(self.business).get('/api/offers/')
+        self.assertNotIn('X-Cache', response)
+
+    def test_profiles_without_offers_keep_the_cache(self):
+        self.anonymous.get('/api/offers/')
+        with self.captureOnCommitCallbacks(execute=True):
+            customer = create_user('customer')
+            customer.profile.location = 'Berlin'
+            customer.profile.save()
+        self.assertEqual(self.anonymous.get('/api/offers/')['X-Cache'], 'HIT')
+
+        self.business.profile.first_name = 'Ada'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.business.profile.save()
+        response = self.anonymous.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['user_details']['first_name'], 'Ada')
@@ -0,0 +1,61 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import BusinessOrderCounter, Order
+from ..serializers.offers.offers_serializers import sync_offer_details
+from .base import CoderrAPITestCase, create_offer, create_order, create_user
+
+
+class OfferDetailsSyncTests(CoderrAPITestCase):
+    """
+    sync_offer_details applies a details list as one diff: updates, creates and deletes in bulk.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.offer = create_offer(self.business, price=100)
+        self.details = {detail.offer_type: detail for detail in self.offer.details.all()}
+
+    def payload(self, **changes):
+        return [
+            {'id': detail.id, 'offer_type': offer_type, **changes.get(offer_type, {})}
+            for offer_type, detail in self.details.items()
+            if changes.get(offer_type) is not False
+        ]
+
+    def test_update_create_and_delete_in_one_pass(self):
+        details = self.payload(basic={'price': 80}, premium=False)
+        details.append({'title': 'Express', 'revisions': 1, 'delivery_time_in_days': 1, 'price': 500,
+                        'features': [], 'offer_type': 'premium'})
+        sync_offer_details(self.offer, details)
+
+        self.offer.refresh_from_db()
+        self.assertEqual(
+            sorted(self.offer.details.values_list('title', 'price')),
+            [('Basic', 80), ('Express', 500), ('Standard', 200)],
+        )
+        self.assertEqual((self.offer.min_price, self.offer.min_delivery_time), (80, 1))
+
+    def test_unchanged_details_write_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            sync_offer_details(self.offer, self.payload())
+        self.assertEqual([query['sql'].split()[0] for query in queries], ['SELECT'])
+
+    def test_removed_details_take_their_orders_out_of_the_counters_in_one_update(self):
+        customers = [create_user(f'customer{index}') for index in range(5)]
+        for customer in customers:
+            create_order(customer, self.offer, offer_type='premium')
+        create_order(customers[0], self.offer, offer_type='premium', status='completed')
+        create_order(customers[0], self.offer, offer_type='basic')
+        counter = BusinessOrderCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed), (6, 1))
+
+        with CaptureQueriesContext(connection) as queries:
+            sync_offer_details(self.offer, self.payload(premium=False))
+        counter_updates = [query for query in queries if query['sql'].startswith('UPDATE "coderr_app_businessordercounter"')]
+        self.assertEqual(len(counter_updates), 1)
+
+        counter.refresh_from_db()
+        self.assertEqual((counter.in_progress, counter.completed), (1, 0))
+        self.assertEqual(Order.objects.count(), 1)
@@ -0,0 +1,43 @@
+from .base import CoderrAPITestCase, create_offer, create_user
+
+
+class OfferFacetsTests(CoderrAPITestCase):
+    """
+    /api/offers/facets/ counts matching offers per price, delivery time and offer type bucket.
+    """
+
+    def setUp(self):
+        super().setUp()
+        business = create_user('business', 'business')
+        # Every offer has packages at price, 2 * price and 3 * price.
+        for price in (40, 60, 80, 100, 120):
+            create_offer(business, title=f'Offer {price}', price=price, delivery_time=2)
+
+    def facets(self, **params):
+        response = self.client.get('/api/offers/facets/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_buckets_count_each_offer_once(self):
+        data = self.facets(price_buckets='0,100,250,500')
+        self.assertEqual(data['offer_count'], 5)
+        # 100-250 holds 1-3 packages of every offer but must report each offer once.
+        self.assertEqual([bucket['count'] for bucket in data['price']], [3, 5, 2, 0])
+        self.assertEqual(data['price'][-1]['max'], None)
+        self.assertEqual(data['offer_type'], {'basic': 5, 'standard': 5, 'premium': 5})
+
+    def test_bucket_count_matches_the_filtered_list(self):
+        data = self.facets(price_buckets='0,100,250')
+        listed = self.client.get('/api/offers/', {'max_price': 99})
+        self.assertEqual(data['price'][0]['count'], listed.data['count'])
+
+    def test_facets_follow_the_list_filters(self):
+        data = self.facets(min_price=100, delivery_buckets='1,3,7')
+        self.assertEqual(data['offer_count'], 2)
+        self.assertEqual([bucket['count'] for bucket in data['delivery_time']], [2, 2, 0])
+
+    def test_invalid_buckets_are_rejected(self):
+        for value in ('10,5', 'a,b', ''.join('1,' * 30) + '100'):
+            with self.subTest(value=value):
+                response = self.client.get('/api/offers/facets/', {'price_buckets': value})
+                self.assertEqual(response.status_code, 400)
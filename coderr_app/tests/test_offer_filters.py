@@ -0,0 +1,41 @@
+from .base import CoderrAPITestCase, create_offer, create_user
+
+
+class OfferFilterTests(CoderrAPITestCase):
+    """
+    Offer filters use the stored minimum values and one EXISTS subquery over the packages.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.first = create_user('first', 'business')
+        self.second = create_user('second', 'business')
+        # Packages: (price, delivery) = (p, d), (2p, d + 2), (3p, d + 4)
+        self.cheap_slow = create_offer(self.first, title='Cheap slow', price=50, delivery_time=10)
+        self.pricey_fast = create_offer(self.first, title='Pricey fast', price=200, delivery_time=1)
+        self.middle = create_offer(self.second, title='Middle', price=100, delivery_time=4)
+
+    def titles(self, **params):
+        response = self.client.get('/api/offers/', {'ordering': 'min_price', **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [offer['title'] for offer in response.data['results']]
+
+    def test_creator_and_lower_bounds(self):
+        self.assertEqual(self.titles(creator_id=self.first.id), ['Cheap slow', 'Pricey fast'])
+        self.assertEqual(self.titles(min_price=100), ['Middle', 'Pricey fast'])
+        self.assertEqual(self.titles(min_delivery_time=4), ['Cheap slow', 'Middle'])
+
+    def test_upper_bounds_must_hold_for_one_package(self):
+        self.assertEqual(self.titles(max_price=100), ['Cheap slow', 'Middle'])
+        self.assertEqual(self.titles(max_delivery_time=4), ['Middle', 'Pricey fast'])
+        # Cheap slow has a package under 100 and none within 4 days; no single package fits both.
+        self.assertEqual(self.titles(max_price=150, max_delivery_time=6), ['Middle'])
+
+    def test_offer_type_returns_each_offer_once(self):
+        self.assertEqual(self.titles(offer_type='premium'), ['Cheap slow', 'Middle', 'Pricey fast'])
+        self.assertEqual(self.titles(offer_type='premium', max_price=200), ['Cheap slow'])
+
+    def test_malformed_values_are_rejected(self):
+        for params in ({'max_price': 'cheap'}, {'creator_id': 'x'}, {'offer_type': 'gold'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/offers/', params).status_code, 400)
@@ -0,0 +1,55 @@
+import json
+
+from ..models import Offer, OfferDetail
+from .base import CoderrAPITestCase, client_for, create_user, details_data
+
+
+class OfferBulkImportTests(CoderrAPITestCase):
+    """
+    /api/offers/bulk/ validates every item, writes the valid ones in bulk and reports a result per item.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.client = client_for(self.business)
+
+    def item(self, index, price=100):
+        return {'title': f'Imported {index}', 'description': 'From the catalog', 'details_data': details_data(price=price)}
+
+    def test_json_import_creates_offers_details_and_search_rows(self):
+        with self.settings(OFFER_BULK_IMPORT_BATCH_SIZE=2):
+            response = self.client.post('/api/offers/bulk/', [self.item(index, 10 + index) for index in range(5)], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(Offer.objects.filter(user=self.business).count(), 5)
+        self.assertEqual(OfferDetail.objects.filter(offer__user=self.business).count(), 15)
+
+        offer = Offer.objects.get(pk=response.data['results'][2]['id'])
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (12, 5))
+        search = self.client.get('/api/offers/', {'search': 'imported'})
+        self.assertEqual(search.data['count'], 5)
+
+    def test_invalid_items_are_reported_and_the_rest_is_created(self):
+        items = [self.item(0), {'title': 'No details'}, 'not an object', self.item(3)]
+        response = self.client.post('/api/offers/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 2))
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'error', 'error', 'created'])
+        self.assertIn('non_field_errors', response.data['results'][2]['errors'])
+
+    def test_ndjson_import(self):
+        body = '\n'.join(json.dumps(self.item(index)) for index in range(3)) + '\n\n'
+        response = self.client.post('/api/offers/bulk/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 3)
+
+    def test_limits_and_permissions(self):
+        with self.settings(OFFER_BULK_IMPORT_MAX_ITEMS=2):
+            response = self.client.post('/api/offers/bulk/', [self.item(index) for index in range(3)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post('/api/offers/bulk/', {'title': 'x'}, format='json').status_code, 400)
+
+        customer = client_for(create_user('customer'))
+        self.assertEqual(customer.post('/api/offers/bulk/', [self.item(0)], format='json').status_code, 403)
+        self.assertFalse(Offer.objects.exists())
@@ -0,0 +1,131 @@
+from ..models import OfferDetail
+from .base import CoderrAPITestCase, client_for, create_offer, create_user, details_data
+
+
+class OfferMinValuesTests(CoderrAPITestCase):
+    """
+    min_price and min_delivery_time are stored on the offer and used for sorting in the database.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+
+    def test_detail_writes_keep_min_values_in_sync(self):
+        offer = create_offer(self.business, price=100, delivery_time=5)
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (100, 5))
+
+        OfferDetail.objects.filter(offer=offer, offer_type='basic').get().delete()
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (200, 7))
+
+        detail = offer.details.get(offer_type='standard')
+        detail.price = 50
+        detail.save()
+        offer.refresh_from_db()
+        self.assertEqual(offer.min_price, 50)
+
+    def test_create_through_api_stores_min_values(self):
+        response = client_for(self.business).post(
+            '/api/offers/',
+            {'title': 'Website', 'description': 'Landing page', 'details_data': details_data(price=80, delivery_time=3)},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(float(response.data['min_price']), 80)
+        self.assertEqual(response.data['min_delivery_time'], 3)
+
+    def test_ordering_by_min_price(self):
+        for price in (300, 100, 200):
+            create_offer(self.business, title=f'Offer {price}', price=price)
+        response = self.client.get('/api/offers/', {'ordering': 'min_price'})
+        self.assertEqual([offer['title'] for offer in response.data['results']], ['Offer 100', 'Offer 200', 'Offer 300'])
+        response = self.client.get('/api/offers/', {'ordering': '-min_price'})
+        self.assertEqual([offer['title'] for offer in response.data['results']], ['Offer 300', 'Offer 200', 'Offer 100'])
+
+
+class OfferCursorPaginationTests(CoderrAPITestCase):
+    """
+    ?pagination=cursor walks the offer list forwards and backwards without gaps or repeats.
+    """
+
+    def setUp(self):
+        super().setUp()
+        business = create_user('business', 'business')
+        for index in range(7):
+            create_offer(business, title=f'Offer {index}', price=100 + (index % 3) * 10)
+
+    def walk(self, params):
+        titles, response = [], self.client.get('/api/offers/', params)
+        pages = [response.data]
+        titles += [offer['title'] for offer in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            pages.append(response.data)
+            titles += [offer['title'] for offer in response.data['results']]
+        return titles, pages
+
+    def test_next_links_cover_every_offer_once(self):
+        titles, pages = self.walk({'pagination': 'cursor', 'page_size': 3, 'ordering': 'min_price'})
+        self.assertEqual(len(titles), 7)
+        self.assertEqual(len(set(titles)), 7)
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertNotIn('count', pages[0])
+        self.assertIsNone(pages[0]['previous'])
+
+        prices = [int(title.split()[1]) % 3 for title in titles]
+        self.assertEqual(prices, sorted(prices))
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.client.get('/api/offers/', {'pagination': 'cursor', 'page_size': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [offer['id'] for offer in back.data['results']],
+            [offer['id'] for offer in first.data['results']],
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/offers/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+
+class OfferSearchTests(CoderrAPITestCase):
+    """
+    ?search= uses the FTS5 index: prefix matches on titles, descriptions and detail texts, best match first.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('business', 'business')
+        self.weak = create_offer(self.business, title='Website', description='Includes a small branding kit')
+        self.strong = create_offer(self.business, title='Branding', description='Branding, brand colours and a brand guide')
+        self.other = create_offer(self.business, title='Translation', description='German to English')
+
+    def search(self, term):
+        response = self.client.get('/api/offers/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [offer['id'] for offer in response.data['results']]
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.search('brand'), [self.strong.id, self.weak.id])
+
+    def test_prefix_and_detail_text_match(self):
+        self.assertEqual(self.search('transl'), [self.other.id])
+        # Detail features ("Flyer") are indexed too.
+        self.assertEqual(len(self.search('flyer')), 3)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.title = 'Proofreading'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.save()
+        self.assertEqual(self.search('proofread'), [self.other.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.delete()
+        self.assertEqual(self.search('proofread'), [])
+
+    def test_fts_syntax_in_terms_is_treated_as_text(self):
+        self.assertEqual(self.search('brand"*)'), [self.strong.id, self.weak.id])
+        # OR is searched as a word, not as an operator.
+        self.assertEqual(self.search('brand OR translation'), [])
+        self.assertEqual(len(self.search('" *')), 3)
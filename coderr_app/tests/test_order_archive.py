@@ -0,0 +1,55 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ..models import ArchivedOrder, BusinessOrderCounter, Order
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class OrderArchiveTests(CoderrAPITestCase):
+    """
+    archive_orders moves long-closed orders in resumable batches; archived orders keep
+    counting and are listed with ?include_archived=1.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customer = create_user('client')
+        offer = create_offer(self.business)
+        self.old_closed = [
+            create_order(self.customer, offer, status=status_value)
+            for status_value in ('completed', 'cancelled', 'completed')
+        ]
+        self.old_open = create_order(self.customer, offer)
+        self.recent_closed = create_order(self.customer, offer, status='completed')
+        long_ago = timezone.now() - timedelta(days=120)
+        Order.objects.filter(pk__in=[order.pk for order in self.old_closed + [self.old_open]]).update(updated_at=long_ago)
+
+    def archive(self, *args):
+        call_command('archive_orders', '--days', '90', *args, stdout=StringIO())
+
+    def test_moves_closed_orders_in_resumable_batches(self):
+        self.archive('--batch-size', '2', '--max-batches', '1')
+        self.assertEqual(ArchivedOrder.objects.count(), 2)
+        self.archive('--batch-size', '2')
+
+        archived_ids = {order.pk for order in self.old_closed}
+        self.assertEqual(set(ArchivedOrder.objects.values_list('pk', flat=True)), archived_ids)
+        self.assertEqual(
+            set(Order.objects.values_list('pk', flat=True)), {self.old_open.pk, self.recent_closed.pk}
+        )
+        counter = BusinessOrderCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (1, 3, 1))
+
+    def test_include_archived_lists_both_tables(self):
+        self.archive()
+        client = client_for(self.customer)
+        live = [order['id'] for order in client.get('/api/orders/').data]
+        self.assertEqual(live, [self.recent_closed.pk, self.old_open.pk])
+        everything = [order['id'] for order in client.get('/api/orders/?include_archived=1').data]
+        self.assertEqual(sorted(everything), sorted(order.pk for order in self.old_closed + [self.old_open, self.recent_closed]))
+        completed = client.get('/api/orders/?include_archived=1&status=completed').data
+        self.assertEqual({order['id'] for order in completed}, {self.old_closed[0].pk, self.old_closed[2].pk, self.recent_closed.pk})
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import BusinessOrderCounter, Order
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class OrderBulkStatusTests(CoderrAPITestCase):
+    """
+    POST /api/orders/bulk-status/ reports a result per ID, updates the owned orders with one
+    UPDATE and adjusts the order counters once per batch.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customer = create_user('client')
+        offer = create_offer(self.business)
+        foreign_offer = create_offer(create_user('agency', type='business'))
+        self.orders = [create_order(self.customer, offer) for _ in range(3)]
+        self.done = create_order(self.customer, offer, status='completed')
+        self.foreign = create_order(self.customer, foreign_offer)
+        self.client = client_for(self.business)
+
+    def post(self, order_ids, status_value='completed'):
+        return self.client.post('/api/orders/bulk-status/', {'order_ids': order_ids, 'status': status_value}, format='json')
+
+    def test_results_per_id_and_counters(self):
+        ids = [order.pk for order in self.orders] + [self.done.pk, self.foreign.pk, 999999]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(ids)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(
+            [item['result'] for item in response.data['results']],
+            ['updated', 'updated', 'updated', 'unchanged', 'forbidden', 'not_found'],
+        )
+        order_updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "coderr_app_order"')]
+        counter_updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "coderr_app_businessordercounter"')]
+        self.assertEqual((len(order_updates), len(counter_updates)), (1, 1))
+
+        self.assertEqual(Order.objects.filter(business_user=self.business, status='completed').count(), 4)
+        self.assertEqual(Order.objects.get(pk=self.foreign.pk).status, 'in_progress')
+        counter = BusinessOrderCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (0, 4, 0))
+
+    def test_rejects_customers_and_invalid_payloads(self):
+        response = client_for(self.customer).post(
+            '/api/orders/bulk-status/', {'order_ids': [self.orders[0].pk], 'status': 'completed'}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.post([], 'completed').status_code, 400)
+        self.assertEqual(self.post([self.orders[0].pk], 'done').status_code, 400)
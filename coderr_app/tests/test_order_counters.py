@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..models import BusinessOrderCounter, Order
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class BusinessOrderCounterTests(CoderrAPITestCase):
+    """
+    The materialized order counts follow order creation, status changes and deletes,
+    and are read by the single and batch count endpoints.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customer = create_user('client')
+        self.offer = create_offer(self.business)
+
+    def counts(self, user=None):
+        counter = BusinessOrderCounter.objects.filter(business_user=user or self.business).first()
+        return (counter.in_progress, counter.completed, counter.cancelled) if counter else None
+
+    def test_order_writes_adjust_counter(self):
+        detail = self.offer.details.get(offer_type='basic')
+        response = client_for(self.customer).post('/api/orders/', {'offer_detail_id': detail.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.counts(), (1, 0, 0))
+
+        order_id = response.data['id']
+        business_client = client_for(self.business)
+        business_client.patch(f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+        self.assertEqual(self.counts(), (0, 1, 0))
+
+        Order.objects.get(pk=order_id).delete()
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_orm_writes_adjust_counter(self):
+        order = create_order(self.customer, self.offer)
+        self.assertEqual(self.counts(), (1, 0, 0))
+        order.status = 'cancelled'
+        order.save()
+        order.save()
+        self.assertEqual(self.counts(), (0, 0, 1))
+        Order.objects.only('id').get(pk=order.pk).save()
+        self.assertEqual(self.counts(), (0, 0, 1))
+        order.status = 'completed'
+        order.delete()
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_count_endpoints_read_counter(self):
+        for status_value in ('in_progress', 'in_progress', 'completed', 'cancelled'):
+            create_order(self.customer, self.offer, status=status_value)
+        other = create_user('agency', type='business')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.data, {'order_count': 2})
+        response = self.client.get(f'/api/completed-order-count/{self.business.pk}/')
+        self.assertEqual(response.data, {'completed_order_count': 1})
+        self.assertEqual(self.client.get(f'/api/order-count/{self.customer.pk}/').status_code, 404)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/order-counts/?business_user_ids={self.business.pk},{other.pk},{self.customer.pk}')
+        self.assertEqual(response.json(), [
+            {'business_user_id': self.business.pk, 'order_count': 2, 'completed_order_count': 1, 'cancelled_order_count': 1},
+            {'business_user_id': other.pk, 'order_count': 0, 'completed_order_count': 0, 'cancelled_order_count': 0},
+        ])
+        self.assertEqual(self.client.get('/api/order-counts/?business_user_ids=a').status_code, 400)
+
+    def test_rebuild_command_recomputes_counters(self):
+        create_order(self.customer, self.offer)
+        create_order(self.customer, self.offer, status='completed')
+        BusinessOrderCounter.objects.update_or_create(business_user=self.business, defaults={'in_progress': 7})
+
+        call_command('rebuild_order_counters', stdout=StringIO())
+
+        self.assertEqual(self.counts(), (1, 1, 0))
@@ -0,0 +1,127 @@
+import sys
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncRequestFactory, override_settings
+from rest_framework.authtoken.models import Token
+
+from .. import events
+from ..views.orders.orders_views import OrderEventStreamView
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class OrderEventAuthTests(CoderrAPITestCase):
+    """
+    The order event stream accepts the API token only in the Authorization header;
+    the query string carries a short-lived stream token instead.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = create_user('client')
+        self.factory = AsyncRequestFactory()
+
+    def open_stream(self, query='', **headers):
+        request = self.factory.get(f'/api/orders/events/{query}', headers=headers)
+        return async_to_sync(OrderEventStreamView.as_view())(request)
+
+    def issue_token(self):
+        response = client_for(self.user).post('/api/orders/events/token/')
+        self.assertEqual(response.status_code, 201)
+        return response.data['token']
+
+    def test_stream_token_opens_stream(self):
+        response = self.open_stream(f'?token={self.issue_token()}')
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'text/event-stream'))
+
+    def test_api_token_only_in_header(self):
+        api_token, created = Token.objects.get_or_create(user=self.user)
+        api_token = api_token.key
+        self.assertEqual(self.open_stream(f'?token={api_token}').status_code, 401)
+        self.assertEqual(self.open_stream(Authorization=f'Token {api_token}').status_code, 200)
+        self.assertEqual(self.open_stream().status_code, 401)
+
+    def test_expired_or_foreign_tokens_are_rejected(self):
+        token = self.issue_token()
+        with override_settings(ORDER_EVENTS_TOKEN_MAX_AGE=-1):
+            self.assertEqual(self.open_stream(f'?token={token}').status_code, 401)
+        self.assertIsNone(events.read_stream_token(token + 'x'))
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.open_stream(f'?token={token}').status_code, 401)
+        self.assertEqual(self.client.post('/api/orders/events/token/').status_code, 401)
+
+    @override_settings(ORDER_EVENTS_BROKER='coderr_app.events.RedisBroker')
+    def test_redis_broker_requires_package(self):
+        with mock.patch.dict(sys.modules, {'redis': None}):
+            with self.assertRaises(ImproperlyConfigured):
+                events.check_broker()
+
+
+class OrderEventDeliveryTests(CoderrAPITestCase):
+    """
+    Committed order changes reach subscribed listeners through the local broker,
+    and a full subscription queue collapses into a single resync event.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customer = create_user('client')
+        offer = create_offer(self.business)
+        self.orders = [create_order(self.customer, offer) for _ in range(2)]
+        self.broker = events.LocalBroker(queue_size=3)
+        patcher = mock.patch.object(events, '_broker', self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def save_status(self, order, status_value):
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = status_value
+            order.save()
+
+    def bulk_status(self, order, status_value):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client_for(self.business).post(
+                '/api/orders/bulk-status/', {'order_ids': [order.pk], 'status': status_value}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+
+    async def test_committed_changes_reach_subscribers(self):
+        subscription = self.broker.subscribe(events.user_channel(self.customer.pk))
+        try:
+            await sync_to_async(self.save_status)(self.orders[0], 'completed')
+            saved = await subscription.get(timeout=1)
+            await sync_to_async(self.bulk_status)(self.orders[1], 'cancelled')
+            bulk = await subscription.get(timeout=1)
+        finally:
+            subscription.close()
+
+        self.assertEqual(saved['type'], 'order.status_changed')
+        self.assertEqual(
+            (saved['order']['id'], saved['order']['status'], saved['order']['business_user']),
+            (self.orders[0].pk, 'completed', self.business.pk),
+        )
+        self.assertEqual((bulk['type'], bulk['order']['id'], bulk['order']['status']),
+                         ('order.status_changed', self.orders[1].pk, 'cancelled'))
+        self.assertEqual(self.broker.subscribers, {})
+
+    async def test_full_queue_sends_one_resync(self):
+        channel = events.user_channel(self.customer.pk)
+        subscription = self.broker.subscribe(channel)
+        try:
+            for number in range(6):
+                self.broker.publish(channel, {'type': 'test', 'number': number})
+            received = []
+            while (event := await subscription.get(timeout=0.1)) is not None:
+                received.append(event)
+            self.assertFalse(subscription.overflowed)
+
+            self.broker.publish(channel, {'type': 'test', 'number': 6})
+            after = await subscription.get(timeout=1)
+        finally:
+            subscription.close()
+
+        self.assertEqual(received, [{'type': 'test', 'number': 0}, {'type': 'test', 'number': 1}, events.RESYNC])
+        self.assertEqual(after, {'type': 'test', 'number': 6})
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+import warnings
+from datetime import datetime, timezone as dt_timezone
+
+from ..models import Order
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class OrderExportTests(CoderrAPITestCase):
+    """
+    GET /api/orders/export/ streams CSV or NDJSON, honours the inbox and date filters
+    and sends the CSV header as its own chunk.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customer = create_user('client')
+        offer = create_offer(self.business)
+        self.orders = [create_order(self.customer, offer, status=status_value) for status_value in ('in_progress', 'completed', 'completed')]
+        for order, day in zip(self.orders, (1, 10, 20)):
+            Order.objects.filter(pk=order.pk).update(created_at=datetime(2024, 3, day, 12, tzinfo=dt_timezone.utc))
+        create_order(create_user('stranger'), create_offer(create_user('agency', type='business')))
+        self.client = client_for(self.business)
+
+    def export(self, query=''):
+        response = self.client.get(f'/api/orders/export/?{query}')
+        chunks = [chunk.decode() for chunk in response.streaming_content] if response.streaming else None
+        return response, chunks
+
+    def csv_ids(self, chunks):
+        return [int(row['id']) for row in csv.DictReader(io.StringIO(''.join(chunks)))]
+
+    def test_csv_header_is_its_own_chunk(self):
+        response, chunks = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertTrue(chunks[0].startswith('id,customer_user_id,business_user_id,title'))
+        self.assertEqual(chunks[0].count('\n'), 1)
+        self.assertEqual(self.csv_ids(chunks), [order.pk for order in self.orders])
+
+    def test_ndjson_with_status_filter(self):
+        response, chunks = self.export('file_format=ndjson&status=completed')
+        rows = [json.loads(line) for line in ''.join(chunks).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.orders[1].pk, self.orders[2].pk])
+        self.assertEqual(rows[0]['features'], ['Logo'])
+
+    def test_date_filters(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            response, chunks = self.export('created_after=2024-03-05&created_before=2024-03-20T12:00:00')
+        self.assertEqual(self.csv_ids(chunks), [self.orders[1].pk])
+        response, chunks = self.export('created_after=2024-03-20T13:00:00%2B02:00')
+        self.assertEqual(self.csv_ids(chunks), [self.orders[2].pk])
+
+    def test_invalid_dates_are_rejected(self):
+        for query in ('created_after=2024-02-30', 'created_before=2024-03-01T25:00:00', 'created_after=soon', 'file_format=xml'):
+            response, chunks = self.export(query)
+            self.assertEqual(response.status_code, 400, query)
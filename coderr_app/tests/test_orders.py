@@ -0,0 +1,60 @@
+from django.test import override_settings
+
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class OrderInboxTests(CoderrAPITestCase):
+    """
+    The order inbox is filtered by role and status, paged with a keyset cursor on request
+    and capped when it is returned as a plain list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customer = create_user('client')
+        offer = create_offer(self.business)
+        other_offer = create_offer(create_user('agency', type='business'))
+        self.orders = [
+            create_order(self.customer, offer, status=status_value)
+            for status_value in ('in_progress', 'completed', 'in_progress', 'cancelled', 'in_progress')
+        ]
+        create_order(create_user('stranger'), other_offer)
+        self.client = client_for(self.business)
+
+    def ids(self, data):
+        return [order['id'] for order in data]
+
+    def test_filters_by_role_and_status(self):
+        newest_first = self.ids(reversed([{'id': order.pk} for order in self.orders]))
+        self.assertEqual(self.ids(self.client.get('/api/orders/').data), newest_first)
+        self.assertEqual(self.client.get('/api/orders/?role=customer').data, [])
+        response = client_for(self.customer).get('/api/orders/?role=customer&status=in_progress')
+        self.assertEqual(self.ids(response.data), [self.orders[4].pk, self.orders[2].pk, self.orders[0].pk])
+        self.assertEqual(self.client.get('/api/orders/?status=open').status_code, 400)
+
+    def test_cursor_pages_follow_next_and_previous(self):
+        first = self.client.get('/api/orders/?pagination=cursor&page_size=2').data
+        self.assertEqual(self.ids(first['results']), [self.orders[4].pk, self.orders[3].pk])
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next']).data
+        self.assertEqual(self.ids(second['results']), [self.orders[2].pk, self.orders[1].pk])
+        last = self.client.get(second['next']).data
+        self.assertEqual(self.ids(last['results']), [self.orders[0].pk])
+        self.assertIsNone(last['next'])
+        back = self.client.get(last['previous']).data
+        self.assertEqual(self.ids(back['results']), [self.orders[2].pk, self.orders[1].pk])
+
+    @override_settings(ORDER_LIST_MAX_RESULTS=3)
+    def test_plain_list_is_capped(self):
+        response = self.client.get('/api/orders/')
+        self.assertEqual(self.ids(response.data), [self.orders[4].pk, self.orders[3].pk, self.orders[2].pk])
+        self.assertEqual(response['X-Results-Truncated'], 'true')
+        response = self.client.get('/api/orders/?status=completed')
+        self.assertNotIn('X-Results-Truncated', response)
+
+    @override_settings(ORDER_LIST_CURSOR_BY_DEFAULT=True)
+    def test_cursor_pagination_by_default(self):
+        response = self.client.get('/api/orders/?page_size=4')
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertIsNotNone(response.data['next'])
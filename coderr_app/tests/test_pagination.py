@@ -0,0 +1,58 @@
+import warnings
+
+from django.core.paginator import UnorderedObjectListWarning
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ..pagination import KeysetPagination, OptInPaginationMixin, PageNumberPagination
+from ..views.offers.offers_views import OfferListView
+from ..views.reviews.reviews_views import ReviewListCreateView
+from .base import CoderrAPITestCase, create_offer, create_user
+
+
+class CursorPagination(KeysetPagination):
+    pass
+
+
+class ExampleView(OptInPaginationMixin):
+    cursor_pagination_class = CursorPagination
+
+    def __init__(self, query):
+        self.request = Request(APIRequestFactory().get(f'/items/{query}'))
+
+
+class OptInPaginationTests(CoderrAPITestCase):
+    """
+    OptInPaginationMixin picks the cursor, page number or no paginator from the query string.
+    """
+
+    def paginator(self, query, **attributes):
+        view = ExampleView(query)
+        for name, value in attributes.items():
+            setattr(view, name, value)
+        return view.paginator
+
+    def test_selects_paginator_from_query(self):
+        self.assertIsNone(self.paginator(''))
+        self.assertIsInstance(self.paginator('?page=2'), PageNumberPagination)
+        self.assertIsInstance(self.paginator('?page_size=5'), PageNumberPagination)
+        self.assertIsInstance(self.paginator('?pagination=cursor'), CursorPagination)
+        self.assertIsInstance(self.paginator('?cursor=abc'), CursorPagination)
+        self.assertIsInstance(self.paginator('', paginate_by_default=True), PageNumberPagination)
+        self.assertIsNone(self.paginator('?pagination=cursor', cursor_pagination_class=None, paginate_by_default=False))
+
+    def test_max_page_size_override(self):
+        self.assertEqual(self.paginator('?page=1').max_page_size, 100)
+        self.assertEqual(self.paginator('?page=1', max_page_size=1000).max_page_size, 1000)
+        self.assertEqual(self.paginator('?pagination=cursor', max_page_size=1000).max_page_size, 1000)
+
+    def test_views_share_the_mixin(self):
+        self.assertTrue(OfferListView.paginate_by_default)
+        self.assertFalse(ReviewListCreateView.paginate_by_default)
+        user = create_user('studio', type='business')
+        offers = [create_offer(user, title=f'Offer {number}') for number in range(3)]
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            data = self.client.get('/api/offers/', {'page_size': 2}).data
+        self.assertEqual(data['count'], 3)
+        self.assertEqual([offer['id'] for offer in data['results']], [offers[2].pk, offers[1].pk])
@@ -0,0 +1,68 @@
+from ..models import Review
+from ..views.offers.offers_views import OfferListView
+from ..views.orders.orders_views import OrderListCreateView
+from ..views.profiles.profiles_views import BusinessProfileListView, CustomerProfileListView
+from ..views.reviews.reviews_views import ReviewListCreateView
+from .base import CoderrAPITestCase, client_for, create_offer, create_order, create_user
+
+
+class ListQueryBudgetTests(CoderrAPITestCase):
+    """
+    Every list endpoint stays within its query_budget, whether it returns one row or many.
+    """
+
+    def populate(self, count):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer')
+        for index in range(count):
+            business = self.business if index == 0 else create_user(f'business{index}', 'business')
+            customer = self.customer if index == 0 else create_user(f'customer{index}')
+            offer = create_offer(business, title=f'Offer {index}', price=10 + index)
+            create_order(self.customer, offer)
+            create_order(customer, offer, offer_type='premium', status='completed')
+            Review.objects.create(business_user=business, reviewer=customer, rating=1 + index % 5, description='Fine')
+        self.client = client_for(self.customer)
+
+    def assert_list_budgets(self):
+        requests = [
+            (OfferListView, '/api/offers/', {'page_size': 100}),
+            (OfferListView, '/api/offers/', {'pagination': 'cursor', 'page_size': 100}),
+            (OrderListCreateView, '/api/orders/', {}),
+            (OrderListCreateView, '/api/orders/', {'pagination': 'cursor', 'page_size': 100}),
+            (ReviewListCreateView, '/api/reviews/', {}),
+            (ReviewListCreateView, '/api/reviews/', {'page_size': 100}),
+            (ReviewListCreateView, '/api/reviews/', {'pagination': 'cursor', 'page_size': 100}),
+            (BusinessProfileListView, '/api/profiles/business/', {}),
+            (BusinessProfileListView, '/api/profiles/business/', {'pagination': 'cursor', 'page_size': 100}),
+            (CustomerProfileListView, '/api/profiles/customer/', {}),
+            (CustomerProfileListView, '/api/profiles/customer/', {'page_size': 100}),
+        ]
+        for view, url, params in requests:
+            with self.subTest(url=url, params=params):
+                with self.assertQueryBudget(view):
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+
+    def test_budgets_with_one_row(self):
+        self.populate(1)
+        self.assert_list_budgets()
+
+    def test_budgets_with_many_rows(self):
+        self.populate(30)
+        self.assert_list_budgets()
+
+    def test_anonymous_offer_list_budget(self):
+        self.populate(30)
+        for attempt in ('miss', 'hit'):
+            with self.subTest(attempt=attempt):
+                with self.assertQueryBudget(OfferListView):
+                    response = self.client_class().get('/api/offers/', {'page_size': 100})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['X-Cache'], attempt.upper())
+
+    def test_budget_overrun_fails_the_test(self):
+        self.populate(1)
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(ReviewListCreateView):
+                for index in range(ReviewListCreateView.query_budget + 1):
+                    Review.objects.count()
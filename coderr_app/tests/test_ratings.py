@@ -0,0 +1,76 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from ..models import BusinessRating, Review
+from .base import CoderrAPITestCase, client_for, create_user
+
+
+class BusinessRatingTests(CoderrAPITestCase):
+    """
+    The per-business rating aggregate follows review writes, feeds profiles and base info,
+    and can be checked and rebuilt from the reviews.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        self.customers = [create_user(f'client{number}') for number in range(3)]
+
+    def review(self, customer, rating):
+        response = client_for(customer).post(
+            '/api/reviews/', {'business_user': self.business.pk, 'rating': rating, 'description': 'Fine'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def summary(self):
+        rating = BusinessRating.objects.get(business_user=self.business)
+        return rating.review_count, rating.rating_sum, rating.histogram
+
+    def test_review_writes_update_aggregate(self):
+        first = self.review(self.customers[0], 5)
+        self.review(self.customers[1], 4)
+        self.review(self.customers[2], 4)
+        self.assertEqual(self.summary(), (3, 13, {'1': 0, '2': 0, '3': 0, '4': 2, '5': 1}))
+
+        client_for(self.customers[0]).patch(f'/api/reviews/{first}/', {'rating': 1}, format='json')
+        self.assertEqual(self.summary(), (3, 9, {'1': 1, '2': 0, '3': 0, '4': 2, '5': 0}))
+
+        client_for(self.customers[0]).delete(f'/api/reviews/{first}/')
+        self.assertEqual(self.summary(), (2, 8, {'1': 0, '2': 0, '3': 0, '4': 2, '5': 0}))
+
+    def test_orm_writes_update_aggregate(self):
+        review = Review.objects.create(business_user=self.business, reviewer=self.customers[0], rating=4, description='Ok')
+        Review.objects.create(business_user=self.business, reviewer=self.customers[1], rating=2, description='Meh')
+        self.assertEqual(self.summary(), (2, 6, {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0}))
+
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 5
+        review.save()
+        review.save()
+        self.assertEqual(self.summary(), (2, 7, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1}))
+
+        review.delete()
+        Review.objects.filter(reviewer=self.customers[1]).delete()
+        self.assertEqual(self.summary(), (0, 0, {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0}))
+
+    def test_profile_and_base_info_read_aggregate(self):
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 4)
+        profile = client_for(self.business).get(f'/api/profile/{self.business.pk}/').data
+        self.assertEqual((profile['rating'], profile['review_count']), (4.5, 2))
+        base_info = self.client.get('/api/base-info/').data
+        self.assertEqual((base_info['review_count'], base_info['average_rating']), (2, 4.5))
+
+    def test_rebuild_command_fixes_drift(self):
+        self.review(self.customers[0], 3)
+        self.review(self.customers[1], 5)
+        BusinessRating.objects.filter(business_user=self.business).update(review_count=9, stars_3=0)
+        Review.objects.create(business_user=self.business, reviewer=self.customers[2], rating=2, description='Late')
+        with self.assertRaisesMessage(CommandError, '1 business users have outdated rating statistics'):
+            call_command('rebuild_business_ratings', '--check', stdout=StringIO())
+
+        call_command('rebuild_business_ratings', stdout=StringIO())
+
+        self.assertEqual(self.summary(), (3, 10, {'1': 0, '2': 1, '3': 1, '4': 0, '5': 1}))
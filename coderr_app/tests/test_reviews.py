@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from ..models import Review
+from .base import CoderrAPITestCase, client_for, create_user
+
+
+class ReviewListTests(CoderrAPITestCase):
+    """
+    The review list keeps its plain default, pages by number on request and pages with a
+    keyset cursor for the updated_at and rating orderings.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.business = create_user('studio', type='business')
+        other = create_user('agency', type='business')
+        start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        self.reviews = []
+        for number, rating in enumerate((3, 5, 1, 4, 5)):
+            review = Review.objects.create(
+                business_user=self.business, reviewer=create_user(f'client{number}'), rating=rating, description='Ok'
+            )
+            Review.objects.filter(pk=review.pk).update(updated_at=start + timedelta(days=number))
+            self.reviews.append(review)
+        Review.objects.create(business_user=other, reviewer=create_user('stranger'), rating=2, description='Meh')
+        self.client = client_for(self.business)
+        self.url = f'/api/reviews/?business_user_id={self.business.pk}'
+
+    def ids(self, data):
+        return [review['id'] for review in data]
+
+    def test_plain_list_newest_first(self):
+        self.assertEqual(self.ids(self.client.get(self.url).data), [review.pk for review in reversed(self.reviews)])
+
+    def test_page_number_pagination(self):
+        data = self.client.get(self.url + '&page=2&page_size=2').data
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(self.ids(data['results']), [self.reviews[2].pk, self.reviews[1].pk])
+
+    def test_cursor_pages_by_rating(self):
+        first = self.client.get(self.url + '&pagination=cursor&ordering=-rating&page_size=2').data
+        self.assertEqual(self.ids(first['results']), [self.reviews[4].pk, self.reviews[1].pk])
+        second = self.client.get(first['next']).data
+        self.assertEqual(self.ids(second['results']), [self.reviews[3].pk, self.reviews[0].pk])
+        last = self.client.get(second['next']).data
+        self.assertEqual((self.ids(last['results']), last['next']), ([self.reviews[2].pk], None))
+        back = self.client.get(last['previous']).data
+        self.assertEqual(self.ids(back['results']), [self.reviews[3].pk, self.reviews[0].pk])
+
+    def test_cursor_pages_by_updated_at(self):
+        first = self.client.get(self.url + '&pagination=cursor&ordering=updated_at&page_size=3').data
+        self.assertEqual(self.ids(first['results']), [review.pk for review in self.reviews[:3]])
+        second = self.client.get(first['next']).data
+        self.assertEqual(self.ids(second['results']), [review.pk for review in self.reviews[3:]])
+        self.assertEqual(self.client.get(self.url + '&pagination=cursor&cursor=bogus').status_code, 404)
+
+    def test_only_cursor_pages_skip_conditional_get(self):
+        self.assertIn('ETag', self.client.get(self.url + '&page=1'))
+        response = self.client.get(self.url + '&pagination=cursor&page_size=2')
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('ETag', self.client.get(response.data['next']))
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from .. import uploads
+from ..models import UploadSession
+from .base import CoderrAPITestCase, client_for, create_user
+
+
+class UploadSessionTests(CoderrAPITestCase):
+    """
+    Resumable uploads: chunks continue at the stored offset, finalize moves the temp file into
+    content-addressed storage and expired sessions are purged.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = create_user('uploader')
+        self.client = client_for(self.user)
+        self.content = os.urandom(3000)
+
+    def start(self, **extra):
+        response = self.client.post('/api/upload/sessions/', {'filename': 'report.pdf', 'size': len(self.content), **extra}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return UploadSession.objects.get(pk=response.data['id'])
+
+    def put(self, session, offset, data):
+        return self.client.put(
+            f'/api/upload/sessions/{session.pk}/', data, content_type='application/octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunks_finalize_into_blob(self):
+        session = self.start(checksum=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.put(session, 0, self.content[:1000]).data['offset'], 1000)
+        stale = self.put(session, 0, self.content[:1000])
+        self.assertEqual((stale.status_code, stale.data['offset']), (409, 1000))
+        self.assertEqual(self.put(session, 1000, self.content[1000:]).data['offset'], 3000)
+
+        response = self.client.post(f'/api/upload/sessions/{session.pk}/finalize/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['checksum'], hashlib.sha256(self.content).hexdigest())
+        self.assertFalse(os.path.exists(uploads.get_temp_path(session)))
+        session.refresh_from_db()
+        with session.upload.file.open('rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+
+        repeated = self.client.post(f'/api/upload/sessions/{session.pk}/finalize/')
+        self.assertEqual((repeated.status_code, repeated.data['file']), (200, response.data['file']))
+
+    def test_finalize_moves_instead_of_copying(self):
+        session = self.start()
+        self.put(session, 0, self.content)
+        with mock.patch.object(uploads.SessionFile, 'chunks', side_effect=AssertionError('copied')):
+            response = self.client.post(f'/api/upload/sessions/{session.pk}/finalize/')
+        self.assertEqual(response.status_code, 201)
+
+    def test_lost_race_returns_conflict(self):
+        session = self.start()
+        append_chunk = uploads.append_chunk
+
+        def append_and_race(session, stream, offset, length):
+            new_offset = append_chunk(session, stream, offset, length)
+            UploadSession.objects.filter(pk=session.pk).update(offset=500)
+            return new_offset
+
+        with mock.patch.object(uploads, 'append_chunk', append_and_race):
+            response = self.put(session, 0, self.content[:1000])
+        self.assertEqual((response.status_code, response.data['offset']), (409, 500))
+        self.assertEqual(os.path.getsize(uploads.get_temp_path(session)), 0)
+
+    def test_no_transaction_while_chunk_streams(self):
+        session = self.start()
+        append_chunk = uploads.append_chunk
+        outer_blocks = len(connection.atomic_blocks)
+        seen = []
+
+        def append_and_record(*args):
+            seen.append(len(connection.atomic_blocks))
+            return append_chunk(*args)
+
+        with mock.patch.object(uploads, 'append_chunk', append_and_record):
+            self.assertEqual(self.put(session, 0, self.content[:1000]).status_code, 200)
+        self.assertEqual(seen, [outer_blocks])
+
+    def test_purge_removes_expired_sessions_and_stray_temp_files(self):
+        expired = self.start()
+        self.put(expired, 0, self.content[:100])
+        active = self.start()
+        UploadSession.objects.filter(pk=expired.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        stray = os.path.join(uploads.get_session_dir(), 'gone.part')
+        open(stray, 'wb').close()
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        os.utime(stray, (two_days_ago, two_days_ago))
+
+        output = StringIO()
+        call_command('purge_upload_sessions', stdout=output)
+
+        self.assertIn('Deleted 1 expired upload sessions and 1 orphaned temp files.', output.getvalue())
+        self.assertEqual(list(UploadSession.objects.values_list('pk', flat=True)), [active.pk])
+        self.assertFalse(os.path.exists(uploads.get_temp_path(expired)))
+        self.assertFalse(os.path.exists(stray))
+        self.assertTrue(os.path.exists(uploads.get_temp_path(active)))
@@ -0,0 +1,93 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from ..models import CustomUser, Profile
+from .base import CoderrAPITestCase, create_offer, create_user
+
+
+class UserProvisioningTests(CoderrAPITestCase):
+    """
+    Registration and provision_users create each user with its profile and token in a few writes,
+    and only profile-visible user changes touch the profile and the offer cache.
+    """
+
+    def test_registration_creates_profile_and_token(self):
+        payload = {'username': 'newbie', 'email': 'newbie@example.com', 'password': 'Str0ng-pass!',
+                   'repeated_password': 'Str0ng-pass!', 'type': 'business'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/registration/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        user = CustomUser.objects.get(username='newbie')
+        self.assertEqual(response.data['token'], Token.objects.get(user=user).key)
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE')])
+
+    def test_login_does_not_touch_profile(self):
+        user = create_user('regular', password='secret')
+        updated_at = user.profile.updated_at
+        response = self.client.post('/api/login/', {'username': 'regular', 'password': 'secret'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Profile.objects.get(user=user).updated_at, updated_at)
+
+    def test_rename_invalidates_offer_cache(self):
+        business = create_user('studio', type='business')
+        with self.captureOnCommitCallbacks(execute=True):
+            create_offer(business)
+        self.client.get('/api/offers/')
+        self.assertEqual(self.client.get('/api/offers/')['X-Cache'], 'HIT')
+
+        business.last_login = business.date_joined
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            business.save()
+        self.assertEqual(callbacks, [])
+
+        business.username = 'atelier'
+        with self.captureOnCommitCallbacks(execute=True):
+            business.save()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['user_details']['username'], 'atelier')
+
+    def test_provision_users_command(self):
+        create_user('taken')
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'users.csv')
+            tokens_out = os.path.join(directory, 'tokens.csv')
+            with open(source, 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['username', 'email', 'password', 'type', 'location'])
+                writer.writerow(['alpha', 'alpha@example.com', 'pw-alpha', 'business', 'Berlin'])
+                writer.writerow(['beta', 'beta@example.com', '', 'customer', ''])
+                writer.writerow(['taken', 'taken@example.com', 'pw', 'customer', ''])
+            call_command('provision_users', source, '--skip-existing', '--workers', '1',
+                         '--hasher', 'md5', '--tokens-out', tokens_out, stdout=StringIO())
+            with open(tokens_out, newline='', encoding='utf-8') as handle:
+                tokens = {row['username']: row['token'] for row in csv.DictReader(handle)}
+
+        alpha = CustomUser.objects.get(username='alpha')
+        self.assertTrue(alpha.check_password('pw-alpha'))
+        self.assertFalse(CustomUser.objects.get(username='beta').has_usable_password())
+        self.assertEqual(alpha.profile.location, 'Berlin')
+        self.assertEqual(tokens['alpha'], Token.objects.get(user=alpha).key)
+        self.assertEqual(set(tokens), {'alpha', 'beta'})
+
+    def test_provision_users_without_password_column(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'users.csv')
+            with open(source, 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['username', 'email'])
+                writer.writerow(['gamma', 'gamma@example.com'])
+            call_command('provision_users', source, '--workers', '1', '--hasher', 'md5', stdout=StringIO())
+
+        gamma = CustomUser.objects.get(username='gamma')
+        self.assertFalse(gamma.has_usable_password())
+        self.assertEqual(gamma.type, 'customer')
+        self.assertTrue(Profile.objects.filter(user=gamma).exists())
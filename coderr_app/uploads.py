@@ -0,0 +1,188 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import UploadSession
+from .storage import get_content_storage
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Running SHA-256 state per session in this process: {session_id: (offset, hasher)}.
+# Hash objects cannot be stored in the database, so a worker that has not seen a session
+# rebuilds the state from the temp file once and continues incrementally from there.
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+# Chunk writes of one session are serialized per process by one of these striped locks. No database
+# lock is held while a chunk streams in; the offset is committed with a conditional UPDATE afterwards.
+_session_locks = [threading.Lock() for _ in range(64)]
+
+
+class UploadConflict(Exception):
+    """
+    Raised when a chunk does not start at the session's current offset.
+    """
+
+
+class SessionFile(File):
+    """
+    The completed temp file of a session. Exposing temporary_file_path() makes
+    FileSystemStorage move the file into place instead of copying its content.
+    """
+
+    def __init__(self, path, name):
+        super().__init__(None, name)
+        self.path = path
+        self.size = os.path.getsize(path)
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def get_session_lock(session_id):
+    return _session_locks[hash(session_id) % len(_session_locks)]
+
+
+def get_session_dir():
+    return os.path.join(settings.MEDIA_ROOT, getattr(settings, 'FILE_UPLOAD_SESSION_DIR', 'upload_sessions'))
+
+
+def get_temp_path(session):
+    return os.path.join(get_session_dir(), f'{session.id}.part')
+
+
+def create_temp_file(session):
+    os.makedirs(get_session_dir(), exist_ok=True)
+    open(get_temp_path(session), 'wb').close()
+
+
+def get_hasher(session):
+    """
+    Returns the SHA-256 state covering the first session.offset bytes.
+    """
+    with _hashers_lock:
+        state = _hashers.get(session.id)
+    if state is not None and state[0] == session.offset:
+        return state[1]
+
+    hasher = hashlib.sha256()
+    remaining = session.offset
+    with open(get_temp_path(session), 'rb') as handle:
+        while remaining > 0:
+            chunk = handle.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            remaining -= len(chunk)
+    return hasher
+
+
+def append_chunk(session, stream, offset, length):
+    """
+    Writes length bytes from stream at the session offset, hashing them on the way.
+    Reads and writes in small blocks so memory stays flat for any chunk size.
+    Returns the new offset.
+    """
+    if offset != session.offset:
+        raise UploadConflict
+    hasher = get_hasher(session)
+    written = 0
+    with open(get_temp_path(session), 'r+b') as handle:
+        handle.seek(offset)
+        handle.truncate()
+        while written < length:
+            block = stream.read(min(READ_CHUNK_SIZE, length - written))
+            if not block:
+                break
+            handle.write(block)
+            hasher.update(block)
+            written += len(block)
+    new_offset = offset + written
+    with _hashers_lock:
+        _hashers[session.id] = (new_offset, hasher)
+    return new_offset
+
+
+def finalize(session):
+    """
+    Moves the completed temp file into content-addressed storage, reusing the digest
+    computed while the chunks arrived; when the blob already exists the temp file is just removed.
+    Returns (stored name, SHA-256 hex digest).
+    """
+    checksum = get_hasher(session).hexdigest()
+    temp_path = get_temp_path(session)
+    name = get_valid_filename(os.path.basename(session.filename)) or 'upload'
+    content = SessionFile(temp_path, name)
+    content.sha256 = checksum
+    stored_name = get_content_storage().save(name, content)
+    discard(session)
+    return stored_name, checksum
+
+
+def truncate(session, offset):
+    """
+    Cuts the temp file back to offset and drops the hash state, e.g. after a chunk lost the race
+    to commit its offset.
+    """
+    forget_hasher(session)
+    try:
+        os.truncate(get_temp_path(session), offset)
+    except FileNotFoundError:
+        pass
+
+
+def forget_hasher(session):
+    """
+    Drops the cached hash state of a session, e.g. after a chunk lost a race.
+    """
+    with _hashers_lock:
+        _hashers.pop(session.id, None)
+
+
+def discard(session):
+    """
+    Removes the temp file and cached hash state of a session.
+    """
+    forget_hasher(session)
+    try:
+        os.remove(get_temp_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def get_expiry_cutoff():
+    """
+    Returns the time of last activity before which sessions are expired (FILE_UPLOAD_SESSION_TTL seconds).
+    """
+    return timezone.now() - timedelta(seconds=getattr(settings, 'FILE_UPLOAD_SESSION_TTL', 24 * 60 * 60))
+
+
+def purge_expired_sessions():
+    """
+    Deletes sessions without activity for FILE_UPLOAD_SESSION_TTL together with their temp files,
+    plus temp files older than that which no session owns. Returns (sessions, files) removed.
+    """
+    cutoff = get_expiry_cutoff()
+    expired = list(UploadSession.objects.filter(updated_at__lt=cutoff).only('id'))
+    for session in expired:
+        discard(session)
+    UploadSession.objects.filter(pk__in=[session.pk for session in expired]).delete()
+
+    files = 0
+    session_dir = get_session_dir()
+    if os.path.isdir(session_dir):
+        stale_before = time.time() - (timezone.now() - cutoff).total_seconds()
+        known = {str(pk) for pk in UploadSession.objects.values_list('pk', flat=True)}
+        for entry in os.scandir(session_dir):
+            session_id = entry.name.removesuffix('.part')
+            if entry.is_file() and session_id not in known and entry.stat().st_mtime < stale_before:
+                os.remove(entry.path)
+                files += 1
+    return len(expired), files
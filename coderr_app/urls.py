@@ -1,12 +1,18 @@
 from django.urls import path, include
-from .views.views import FileUploadView, BaseInfoView
+from .views.views import (
+    FileUploadView,
+    BaseInfoView,
+    UploadSessionCreateView,
+    UploadSessionDetailView,
+    UploadSessionFinalizeView,
+)
 from .views.profiles.profiles_views import (
     UserRegistrationView, 
     UserLoginView,
     ProfileDetailView,
 )
 from .views.offers.offers_views import OfferDetailView
-from .views.orders.orders_views import OrderCountView, CompletedOrderCountView
+from .views.orders.orders_views import OrderCountView, CompletedOrderCountView, BusinessOrderCountsView
 
 
 urlpatterns = [
@@ -18,8 +24,12 @@ urlpatterns = [
     path('offerdetails/<int:pk>/', OfferDetailView.as_view(), name='offerdetail-detail'), 
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'), 
     path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),  
+    path('order-counts/', BusinessOrderCountsView.as_view(), name='order-counts'),
     path('orders/', include('coderr_app.views.orders.urls')),     
     path('reviews/', include('coderr_app.views.reviews.urls')),   
     path('upload/', FileUploadView.as_view(), name='file-upload'), 
+    path('upload/sessions/', UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('upload/sessions/<uuid:pk>/', UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('upload/sessions/<uuid:pk>/finalize/', UploadSessionFinalizeView.as_view(), name='upload-session-finalize'),
     path('base-info/', BaseInfoView.as_view(), name='base-info'),   
 ]
\ No newline at end of file
@@ -0,0 +1,90 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Exists, OuterRef
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from ... import search
+from ...models import OfferDetail
+
+
+class OfferFilterBackend(filters.BaseFilterBackend):
+    """
+    Filters offers by creator, price, delivery time and offer type without joining the details.
+    Bounds on the cheapest/fastest package use the stored Offer.min_price and Offer.min_delivery_time.
+    Upper bounds and offer_type compile into one EXISTS subquery over OfferDetail that a single
+    package must satisfy, backed by the (offer, price) and (offer, delivery_time_in_days) indexes.
+    No offer is returned twice and nothing is grouped.
+    """
+    integer_params = ('creator_id', 'min_delivery_time', 'max_delivery_time')
+    decimal_params = ('min_price', 'max_price')
+
+    def filter_queryset(self, request, queryset, view):
+        params = self.get_params(request)
+
+        if params.get('creator_id') is not None:
+            queryset = queryset.filter(user_id=params['creator_id'])
+        if params.get('min_price') is not None:
+            queryset = queryset.filter(min_price__gte=params['min_price'])
+        if params.get('min_delivery_time') is not None:
+            queryset = queryset.filter(min_delivery_time__gte=params['min_delivery_time'])
+
+        package_filters = {}
+        if params.get('max_price') is not None:
+            package_filters['price__lte'] = params['max_price']
+        if params.get('max_delivery_time') is not None:
+            package_filters['delivery_time_in_days__lte'] = params['max_delivery_time']
+        if params.get('offer_type'):
+            package_filters['offer_type'] = params['offer_type']
+        if package_filters:
+            packages = OfferDetail.objects.filter(offer_id=OuterRef('pk'), **package_filters)
+            queryset = queryset.filter(Exists(packages))
+        return queryset
+
+    def get_params(self, request):
+        """
+        Parses the filter query parameters, rejecting malformed values with a 400 response.
+        """
+        query_params = request.query_params
+        params = {}
+        errors = {}
+        for name in self.integer_params + self.decimal_params:
+            raw = query_params.get(name)
+            if raw in (None, ''):
+                continue
+            try:
+                params[name] = int(raw) if name in self.integer_params else Decimal(raw)
+            except (ValueError, InvalidOperation):
+                errors[name] = ['A valid number is required.']
+
+        offer_type = query_params.get('offer_type')
+        if offer_type:
+            if offer_type not in dict(OfferDetail.OFFER_TYPE_CHOICES):
+                errors['offer_type'] = [f'"{offer_type}" is not a valid offer type.']
+            params['offer_type'] = offer_type
+
+        if errors:
+            raise ValidationError(errors)
+        return params
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Search filter backed by the FTS5 offer index.
+    Matches are ranked by bm25; other databases fall back to the default LIKE search.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Restricts the queryset to offers matching the search terms, best matches first.
+        """
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        if not search.is_available():
+            return super().filter_queryset(request, queryset, view)
+
+        match_query = search.build_match_query(search_terms)
+        if not match_query:
+            return queryset
+        return queryset.filter(search_index__document__match=match_query).order_by('search_index__rank', 'id')
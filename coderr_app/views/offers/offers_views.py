@@ -1,33 +1,71 @@
-from rest_framework import generics, permissions, status, parsers, filters, pagination
-from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
+from rest_framework import generics, permissions, status, parsers
+from rest_framework.permissions import AllowAny, BasePermission, IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Min, Q
-from django.db import transaction
+import time
 
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.db import DatabaseError, transaction
+
+from ... import cache, search
+from ...conditional import ConditionalGetMixin
 from ...models import Offer, OfferDetail
-from ...serializers.offers.offers_serializers import OfferDetailSerializer, OfferSerializer # Importiere Offer Serializers
+from ...pagination import KeysetPagination, OptInPaginationMixin
+from ...parsers import NDJSONParser
+from .filters import OfferFilterBackend, OfferSearchFilter
+from ...serializers.offers.offers_serializers import OfferDetailSerializer, OfferSerializer, sync_offer_details # Importiere Offer Serializers
 
 
-class OfferPagination(pagination.PageNumberPagination):
+class OfferCursorPagination(KeysetPagination):
     """
-    Pagination class for offers.
+    Opt-in cursor pagination for offers (?pagination=cursor).
+    Keyed on (updated_at, id) by default and on (min_price, id) for price ordering.
     """
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 1000
+    orderings = {
+        'updated_at': (('updated_at', False), ('id', False)),
+        '-updated_at': (('updated_at', True), ('id', True)),
+        'min_price': (('min_price', False), ('id', False)),
+        '-min_price': (('min_price', True), ('id', True)),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Returns the keyset matching the requested ordering, newest first by default.
+        """
+        return self.orderings.get(request.query_params.get('ordering'), self.orderings['-updated_at'])
 
-class OfferListView(generics.ListCreateAPIView):
+class OfferListView(OptInPaginationMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     View to list and create offers. Supports filtering, searching, and ordering.
+    The list is always paged, by page number unless ?pagination=cursor is sent.
     """
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.select_related('user__profile', 'user__rating_summary').prefetch_related('details')
+    query_budget = 4
+    last_modified_validates = False
     serializer_class = OfferSerializer
-    pagination_class = OfferPagination
-    filter_backends = [filters.SearchFilter]
+    cursor_pagination_class = OfferCursorPagination
+    paginate_by_default = True
+    max_page_size = 1000
+    filter_backends = [OfferFilterBackend, OfferSearchFilter]
     ordering_fields = ['updated_at', 'min_price']
     search_fields = ['title', 'description']
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
 
+    def get_conditional_state(self, request):
+        """
+        Versions the list by its offer list cache key, i.e. the offers generation plus the normalized
+        query. Every write that can change an offer list bumps the generation, so the ETag needs no
+        query, and a 304 or a cache hit costs one cache lookup. There is no Last-Modified for lists.
+        """
+        return None, (self.get_cache_key(request),)
+
+    def get_cache_key(self, request):
+        if not hasattr(self, '_cache_key'):
+            self._cache_key = cache.build_offer_list_key(request)
+        return self._cache_key
+
     def get_permissions(self):
         """
         Determines permissions based on the request method (POST requires authentication).
@@ -36,43 +74,41 @@ class OfferListView(generics.ListCreateAPIView):
             return [IsAuthenticated()]
         return [AllowAny()]
 
-    def get_queryset(self):
+    def list(self, request, *args, **kwargs):
         """
-        Filters offers based on query parameters like creator_id, min_price, and max_delivery_time.
+        Lists offers, serving anonymous requests from the versioned offer list cache.
         """
-        queryset = super().get_queryset()
-        creator_id = self.request.query_params.get('creator_id')
-        min_price = self.request.query_params.get('min_price')
-        max_delivery_time = self.request.query_params.get('max_delivery_time')
+        if request.user.is_authenticated:
+            return self.list_offers(request)
 
-        if creator_id:
-            queryset = queryset.filter(user_id=creator_id)
-        if min_price:
-            queryset = queryset.filter(details__price__gte=min_price)
+        cache_key = self.get_cache_key(request)
+        data = cache.get_cached_data(cache_key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
 
-        if max_delivery_time:
-            queryset = queryset.annotate(
-                min_delivery_time_annotated=Min('details__delivery_time_in_days')
-            ).filter(min_delivery_time_annotated__lte=max_delivery_time)
+        response = self.list_offers(request)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set_cached_data(cache_key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
 
-        return queryset
-
-    def list(self, request, *args, **kwargs):
+    def list_offers(self, request):
         """
         Lists offers with support for custom ordering by 'min_price' and 'updated_at'.
-        Handles pagination and returns paginated results.
+        Ordering runs in the database so only the requested page is loaded; without a requested
+        ordering or search ranking, pages are newest first like the cursor pages.
         """
         queryset = self.filter_queryset(self.get_queryset())
 
         ordering = request.query_params.get('ordering')
         if ordering == 'min_price':
-            queryset = sorted(queryset, key=lambda offer: offer.min_price or float('inf'))
+            queryset = queryset.order_by(F('min_price').asc(nulls_last=True), 'id')
         elif ordering == '-min_price':
-            queryset = sorted(queryset, key=lambda offer: offer.min_price or float('-inf'), reverse=True)
+            queryset = queryset.order_by(F('min_price').desc(nulls_last=True), '-id')
         elif ordering == 'updated_at':
-            queryset = queryset.order_by('updated_at')
-        elif ordering == '-updated_at':
-             queryset = queryset.order_by('-updated_at')
+            queryset = queryset.order_by('updated_at', 'id')
+        elif ordering == '-updated_at' or not queryset.query.order_by:
+            queryset = queryset.order_by('-updated_at', '-id')
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -93,6 +129,186 @@ class OfferListView(generics.ListCreateAPIView):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+class OfferFacetsView(OfferListView):
+    """
+    View to return price, delivery time and offer type facets for the current offer filters.
+    Uses the same filters and search as the offer list. Results are cached per filter set under
+    the offers generation; a miss runs one aggregate query.
+    """
+    http_method_names = ['get', 'head', 'options']
+    query_budget = 2
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns all histograms, computed with a single aggregate query over the matching offer details.
+        """
+        try:
+            price_buckets = self.get_buckets('price_buckets', settings.OFFER_FACET_PRICE_BUCKETS)
+            delivery_buckets = self.get_buckets('delivery_buckets', settings.OFFER_FACET_DELIVERY_BUCKETS)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = cache.build_offer_list_key(request, prefix='facets')
+        data = cache.get_cached_data(cache_key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        offers = self.filter_queryset(self.get_queryset()).order_by().values('pk')
+        aggregates = {'offer_count': Count('offer', distinct=True)}
+        aggregates.update(self.bucket_aggregates('price', 'price', price_buckets))
+        aggregates.update(self.bucket_aggregates('delivery', 'delivery_time_in_days', delivery_buckets))
+        for offer_type, label in OfferDetail.OFFER_TYPE_CHOICES:
+            aggregates[f'type_{offer_type}'] = Count('offer', distinct=True, filter=Q(offer_type=offer_type))
+        counts = OfferDetail.objects.filter(offer__in=offers).aggregate(**aggregates)
+
+        data = {
+            'offer_count': counts['offer_count'],
+            'price': self.bucket_counts('price', price_buckets, counts),
+            'delivery_time': self.bucket_counts('delivery', delivery_buckets, counts),
+            'offer_type': {offer_type: counts[f'type_{offer_type}'] for offer_type, label in OfferDetail.OFFER_TYPE_CHOICES},
+        }
+        cache.set_cached_data(cache_key, data)
+        return Response(data, headers={'X-Cache': 'MISS'})
+
+    def get_buckets(self, param, default):
+        """
+        Returns the ascending lower bucket boundaries from a comma-separated query parameter or the default.
+        """
+        raw = self.request.query_params.get(param)
+        if not raw:
+            return list(default)
+        try:
+            buckets = [int(value) for value in raw.split(',')]
+        except ValueError:
+            raise ValueError(f"'{param}' must be a comma-separated list of integers.")
+        if buckets != sorted(set(buckets)) or not 0 < len(buckets) <= settings.OFFER_FACET_MAX_BUCKETS:
+            raise ValueError(f"'{param}' must contain up to {settings.OFFER_FACET_MAX_BUCKETS} strictly ascending values.")
+        return buckets
+
+    def bucket_aggregates(self, prefix, field, buckets):
+        """
+        Builds one filtered COUNT per bucket [lower, next lower); the last bucket has no upper bound.
+        Offers are counted once per bucket however many of their packages fall into it,
+        so a count matches the offers the list returns for that range.
+        """
+        aggregates = {}
+        for position, lower in enumerate(buckets):
+            condition = Q(**{f'{field}__gte': lower})
+            if position + 1 < len(buckets):
+                condition &= Q(**{f'{field}__lt': buckets[position + 1]})
+            aggregates[f'{prefix}_{position}'] = Count('offer', distinct=True, filter=condition)
+        return aggregates
+
+    def bucket_counts(self, prefix, buckets, counts):
+        return [
+            {
+                'min': lower,
+                'max': buckets[position + 1] if position + 1 < len(buckets) else None,
+                'count': counts[f'{prefix}_{position}'],
+            }
+            for position, lower in enumerate(buckets)
+        ]
+
+class OfferBulkCreateView(APIView):
+    """
+    View to import many offers with nested details in one request.
+    Accepts a JSON array or an NDJSON stream, validates every item first and writes the
+    valid ones with bulk_create in batched transactions. Returns a result per item.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [parsers.JSONParser, NDJSONParser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Validates and creates the submitted offers, reporting throughput in offers per second.
+        """
+        if request.user.type != 'business':
+            return Response({"detail": "Only business users can create offers."}, status=status.HTTP_403_FORBIDDEN)
+
+        items = request.data
+        if not isinstance(items, list):
+            return Response({"detail": "Expected a list of offers."}, status=status.HTTP_400_BAD_REQUEST)
+        max_items = settings.OFFER_BULK_IMPORT_MAX_ITEMS
+        if len(items) > max_items:
+            return Response({"detail": f"At most {max_items} offers can be imported per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+        started = time.perf_counter()
+        results = [None] * len(items)
+        valid_items = self.validate_items(items, results)
+
+        batch_size = settings.OFFER_BULK_IMPORT_BATCH_SIZE
+        for start in range(0, len(valid_items), batch_size):
+            self.write_batch(request.user, valid_items[start:start + batch_size], results)
+        if valid_items:
+            cache.bump_offers_generation()
+
+        elapsed = time.perf_counter() - started
+        created = sum(1 for result in results if result['status'] == 'created')
+        return Response({
+            'created': created,
+            'failed': len(results) - created,
+            'duration_ms': round(elapsed * 1000, 1),
+            'offers_per_second': round(created / elapsed, 1) if elapsed else created,
+            'results': results,
+        }, status=status.HTTP_201_CREATED if created and created == len(results) else status.HTTP_200_OK)
+
+    def validate_items(self, items, results):
+        """
+        Validates every item with OfferSerializer and records errors in results.
+        One serializer instance is reused for all items, like ListSerializer does, so fields are built once.
+        Returns (index, validated_data) pairs for the valid items.
+        """
+        valid_items = []
+        serializer = OfferSerializer(context={'request': self.request})
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'index': index, 'status': 'error', 'errors': {'non_field_errors': ['Expected an object.']}}
+                continue
+            try:
+                valid_items.append((index, serializer.run_validation(item)))
+            except ValidationError as exc:
+                results[index] = {'index': index, 'status': 'error', 'errors': exc.detail}
+        return valid_items
+
+    def write_batch(self, user, batch, results):
+        """
+        Writes one batch of offers and their details with two bulk inserts in a single transaction.
+        Sets the stored minimum values and search index rows directly, since bulk_create sends no signals.
+        """
+        offers = []
+        details_per_offer = []
+        for index, data in batch:
+            details = [
+                OfferDetail(**{key: value for key, value in detail_data.items() if key != 'id'})
+                for detail_data in data['details']
+            ]
+            prices = [detail.price for detail in details if detail.price is not None]
+            delivery_times = [detail.delivery_time_in_days for detail in details if detail.delivery_time_in_days is not None]
+            offers.append(Offer(
+                user=user,
+                title=data['title'],
+                description=data['description'],
+                min_price=min(prices) if prices else None,
+                min_delivery_time=min(delivery_times) if delivery_times else None,
+            ))
+            details_per_offer.append(details)
+
+        try:
+            with transaction.atomic():
+                Offer.objects.bulk_create(offers)
+                for offer, details in zip(offers, details_per_offer):
+                    for detail in details:
+                        detail.offer = offer
+                OfferDetail.objects.bulk_create([detail for details in details_per_offer for detail in details])
+                search.add_offers(zip(offers, details_per_offer))
+        except DatabaseError:
+            for index, data in batch:
+                results[index] = {'index': index, 'status': 'error', 'errors': {'non_field_errors': ['The offer could not be saved.']}}
+            return
+
+        for (index, data), offer in zip(batch, offers):
+            results[index] = {'index': index, 'status': 'created', 'id': offer.pk}
+
 class IsOwnerOrReadOnly(BasePermission):
     """
     Custom permission to only allow owners of an object to edit it.
@@ -106,13 +322,23 @@ class IsOwnerOrReadOnly(BasePermission):
 
         return obj.user == request.user
 
-class OfferDetailView(generics.RetrieveAPIView):
+class OfferDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     View to retrieve offer details.
     """
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailSerializer
     permission_classes = [AllowAny]
+    query_budget = 3
+
+    def get_conditional_state(self, request):
+        """
+        Returns the parent offer's updated_at, which moves on every detail change.
+        """
+        updated_at = OfferDetail.objects.filter(pk=self.kwargs['pk']).values_list('offer__updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return updated_at, (updated_at,)
 
 class OfferDetailDeleteView(generics.RetrieveDestroyAPIView):
     """
@@ -122,15 +348,25 @@ class OfferDetailDeleteView(generics.RetrieveDestroyAPIView):
     serializer_class = OfferDetailSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
 
-class OfferUpdateView(generics.RetrieveUpdateDestroyAPIView):
+class OfferUpdateView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     View to retrieve, update, and delete offers.
     """
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.select_related('user__profile', 'user__rating_summary')
+    query_budget = 4
     serializer_class = OfferSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
 
+    def get_conditional_state(self, request):
+        """
+        Returns the offer's updated_at together with its creator's profile updated_at.
+        """
+        row = Offer.objects.filter(pk=self.kwargs['pk']).values_list('updated_at', 'user__profile__updated_at').first()
+        if row is None:
+            return None
+        return max(filter(None, row)), row
+
     def patch(self, request, *args, **kwargs):
         """
         Updates an existing offer, including offer details and image.
@@ -148,42 +384,11 @@ class OfferUpdateView(generics.RetrieveUpdateDestroyAPIView):
 
         details_data = request.data.get('details')
         if details_data is not None:
-            self.update_details(instance, details_data)
+            sync_offer_details(instance, details_data)
 
         self.perform_update(serializer)
         return Response(serializer.data)
 
-    def update_details(self, offer, details_data):
-        """
-        Updates offer details, adding new ones, updating existing ones, and deleting removed ones.
-        Uses atomic transactions to ensure data consistency.
-        """
-        existing_details = {detail.id: detail for detail in offer.details.all()}
-        updated_detail_ids = []
-
-        with transaction.atomic():
-            for detail_data in details_data:
-                detail_id = detail_data.get('id')
-
-                if detail_id:
-                    detail = existing_details.get(detail_id)
-                    if detail:
-                        serializer = OfferDetailSerializer(detail, data=detail_data, partial=True)
-                        serializer.is_valid(raise_exception=True)
-                        serializer.save()
-                        updated_detail_ids.append(detail_id)
-
-
-                else:
-                    serializer = OfferDetailSerializer(data=detail_data)
-                    serializer.is_valid(raise_exception=True)
-                    serializer.save(offer=offer)
-
-
-            for detail_id, detail in existing_details.items():
-                if detail_id not in updated_detail_ids:
-                    detail.delete()
-
     def perform_update(self, serializer):
         """
         Saves the updated serializer data.
@@ -194,4 +399,16 @@ class OfferUpdateView(generics.RetrieveUpdateDestroyAPIView):
         """
         Deletes an offer.
         """
-        return self.destroy(request, *args, **kwargs)
\ No newline at end of file
+        return self.destroy(request, *args, **kwargs)
+
+class OfferListCacheStatsView(APIView):
+    """
+    View to report hit and miss counts of the offer list cache (admin only).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns the cache statistics of the current process.
+        """
+        return Response(cache.get_cache_stats())
\ No newline at end of file
@@ -2,9 +2,15 @@ from django.urls import path
 from .offers_views import (
     OfferListView,
     OfferUpdateView,
+    OfferListCacheStatsView,
+    OfferBulkCreateView,
+    OfferFacetsView,
 )
 
 urlpatterns = [
     path('', OfferListView.as_view(), name='offer-list'),
     path('<int:pk>/', OfferUpdateView.as_view(), name='offer-update'),
+    path('facets/', OfferFacetsView.as_view(), name='offer-facets'),
+    path('bulk/', OfferBulkCreateView.as_view(), name='offer-bulk-create'),
+    path('cache-stats/', OfferListCacheStatsView.as_view(), name='offer-list-cache-stats'),
 ]
\ No newline at end of file
@@ -1,30 +1,153 @@
+import csv
+import io
+import json
+from datetime import datetime, time
+
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.views import APIView
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views import View
+
+from ... import events
+from ...idempotency import IdempotentCreateMixin
+from ...models import ArchivedOrder, BusinessOrderCounter, Order, CustomUser
+from ...pagination import KeysetPagination
+from ...streaming import batch_text, stream_response
+from ...serializers.orders.orders__serializers import (
+    OrderSerializer,
+    OrderCountSerializer,
+    CompletedOrderCountSerializer,
+    BusinessOrderCountsSerializer,
+    OrderBulkStatusSerializer,
+)
+
+
+def get_business_order_counts(business_user_ids):
+    """
+    Reads the materialized order counts of business users with a single query.
+    Business users without orders get zeros; unknown or non-business ids are left out.
+    """
+    return list(
+        CustomUser.objects.filter(id__in=business_user_ids, type='business')
+        .order_by('id')
+        .values(business_user_id=F('id'))
+        .annotate(
+            order_count=Coalesce('order_counter__in_progress', 0),
+            completed_order_count=Coalesce('order_counter__completed', 0),
+            cancelled_order_count=Coalesce('order_counter__cancelled', 0),
+        )
+    )
 
-from ...models import Order, CustomUser
-from ...serializers.orders.orders__serializers import OrderSerializer, OrderCountSerializer, CompletedOrderCountSerializer
 
+def get_single_business_order_counts(business_user_id):
+    counts = get_business_order_counts([business_user_id])
+    if not counts:
+        raise Http404('No business user matches the given query.')
+    return counts[0]
 
-class OrderListCreateView(generics.ListCreateAPIView):
+
+class OrderCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for the order inbox (?pagination=cursor, or always with ORDER_LIST_CURSOR_BY_DEFAULT), newest first.
+    """
+    ordering = (('created_at', True), ('id', True))
+
+
+class OrderInboxMixin:
+    """
+    Builds the order queries of the current user from ?status=, ?role=customer|business and ?include_archived=1.
+    """
+    roles = ('customer', 'business')
+
+    def get_queryset_branches(self):
+        """
+        Splits the inbox into one query per role and status instead of an OR over both user columns.
+        Each branch matches a (user, status, created_at) index exactly, so it is read in order
+        from the index; the branches are combined with UNION.
+        """
+        user = self.request.user
+        role = self.request.query_params.get('role')
+        status_value = self.request.query_params.get('status')
+        statuses = [choice for choice, label in Order.STATUS_CHOICES]
+        if role is not None and role not in self.roles:
+            raise ValidationError({'role': f"Must be one of: {', '.join(self.roles)}."})
+        if status_value is not None and status_value not in statuses:
+            raise ValidationError({'status': f"Must be one of: {', '.join(statuses)}."})
+
+        roles = [role] if role else self.roles
+        statuses = [status_value] if status_value else statuses
+        branches = [
+            Order.objects.filter(**{f'{role_name}_user': user, 'status': status_name})
+            for role_name in roles
+            for status_name in statuses
+        ]
+        if self.request.query_params.get('include_archived') in ('1', 'true'):
+            branches += [
+                ArchivedOrder.objects.filter(**{f'{role_name}_user': user, 'status': status_name})
+                for role_name in roles
+                for status_name in statuses
+                if status_name in ArchivedOrder.ARCHIVABLE_STATUSES
+            ]
+        return branches
+
+
+class OrderListCreateView(OrderInboxMixin, IdempotentCreateMixin, generics.ListCreateAPIView):
     """
     View to list and create orders.
+    Lists can be filtered with ?status= and ?role=customer|business, and ?include_archived=1 adds archived orders;
+    creation honours Idempotency-Key.
+    Cursor pagination is opt-in (?pagination=cursor) because existing clients expect a plain list;
+    ORDER_LIST_CURSOR_BY_DEFAULT pages every request instead. The plain list is capped at the newest
+    ORDER_LIST_MAX_RESULTS orders, so a busy account never downloads its whole history on a poll.
     """
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OrderCursorPagination
+    query_budget = 2
 
     def get_queryset(self):
         """
-        Retrieves orders related to the current user, either as a customer or business user.
+        Retrieves orders related to the current user, either as a customer or business user, newest first.
         """
-        user = self.request.user
-        return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+        branches = self.get_queryset_branches()
+        combined = branches[0].union(*branches[1:]) if len(branches) > 1 else branches[0]
+        return combined.order_by('-created_at', '-id')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lists the orders of the current user. Paginated, the inbox is returned in pages, each read with
+        a bounded index range scan per branch. Unpaginated, at most ORDER_LIST_MAX_RESULTS orders are
+        returned and X-Results-Truncated is set when there are more.
+        """
+        if getattr(settings, 'ORDER_LIST_CURSOR_BY_DEFAULT', False) or OrderCursorPagination.is_requested(request):
+            page = self.paginator.paginate_union(self.get_queryset_branches(), request, view=self)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        max_results = getattr(settings, 'ORDER_LIST_MAX_RESULTS', 500)
+        orders = list(self.get_queryset()[:max_results + 1])
+        serializer = self.get_serializer(orders[:max_results], many=True)
+        response = Response(serializer.data)
+        if len(orders) > max_results:
+            response['X-Results-Truncated'] = 'true'
+        return response
 
     def create(self, request, *args, **kwargs):
         """
-        Creates a new order.
+        Creates a new order. Retries sent with the same Idempotency-Key return the first response.
         """
         return super().create(request, *args, **kwargs)
 
@@ -88,7 +211,7 @@ class OrderUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 
     def perform_destroy(self, instance):
         """
-        Deletes the order instance.
+        Deletes the order instance. The business user's order counter is decremented by a post_delete signal.
         """
         instance.delete()
 
@@ -101,21 +224,249 @@ class OrderUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         return super().handle_exception(exc)
 
 
+class OrderExportView(OrderInboxMixin, APIView):
+    """
+    View to export the orders of the current user as CSV or NDJSON (?file_format=csv|ndjson).
+    Supports the order list filters plus ?created_after= and ?created_before= (ISO date or datetime).
+    """
+    permission_classes = [IsAuthenticated]
+    fields = (
+        'id', 'customer_user_id', 'business_user_id', 'title', 'offer_type', 'status', 'price',
+        'revisions', 'delivery_time_in_days', 'features', 'created_at', 'updated_at',
+    )
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def get(self, request, *args, **kwargs):
+        """
+        Streams the export oldest first. Rows are read with a server-side iterator and written in
+        batches, so memory stays flat for any number of orders and the header is sent right away.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in self.content_types:
+            raise ValidationError({'file_format': f"Must be one of: {', '.join(self.content_types)}."})
+        date_filters = self.get_date_filters()
+        branches = [branch.filter(**date_filters).values(*self.fields) for branch in self.get_queryset_branches()]
+        combined = branches[0].union(*branches[1:]) if len(branches) > 1 else branches[0]
+        rows = combined.order_by('created_at', 'id').iterator(chunk_size=getattr(settings, 'ORDER_EXPORT_CHUNK_SIZE', 2000))
+
+        filename = f"orders-{timezone.now():%Y%m%d}.{file_format}"
+        return stream_response(
+            request,
+            self.get_chunks(file_format, rows),
+            content_type=self.content_types[file_format],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+        )
+
+    def get_date_filters(self):
+        """
+        Parses ?created_after= and ?created_before= into created_at lookups.
+        Dates mean midnight and values without an offset are taken in the current time zone.
+        """
+        filters = {}
+        for param, lookup in (('created_after', 'created_at__gte'), ('created_before', 'created_at__lt')):
+            raw = self.request.query_params.get(param)
+            if not raw:
+                continue
+            try:
+                value = parse_datetime(raw)
+                if value is None:
+                    date = parse_date(raw)
+                    value = datetime.combine(date, time.min) if date is not None else None
+            except ValueError:
+                raise ValidationError({param: 'Not a valid date or time.'})
+            if value is None:
+                raise ValidationError({param: 'Expected an ISO 8601 date or datetime.'})
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            filters[lookup] = value
+        return filters
+
+    def get_chunks(self, file_format, rows):
+        """
+        Yields the CSV header on its own, so it is sent before the first row is read,
+        then the rows in batches of ORDER_EXPORT_CHUNK_SIZE lines.
+        """
+        if file_format == 'csv':
+            lines = self.csv_lines(rows)
+            yield next(lines)
+        else:
+            lines = self.ndjson_lines(rows)
+        yield from batch_text(lines, getattr(settings, 'ORDER_EXPORT_CHUNK_SIZE', 2000))
+
+    def csv_lines(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def line(values):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue()
+
+        yield line(self.fields)
+        for row in rows:
+            yield line([
+                json.dumps(row[field]) if field == 'features' else row[field]
+                for field in self.fields
+            ])
+
+    def ndjson_lines(self, rows):
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+class OrderEventTokenView(APIView):
+    """
+    View to issue the short-lived token that opens the order event stream.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Returns a signed token for ?token= on /api/orders/events/. EventSource cannot send headers,
+        and a query string ends up in logs, so the stream never accepts the user's API token there.
+        """
+        return Response({
+            "token": events.issue_stream_token(request.user),
+            "expires_in": getattr(settings, 'ORDER_EVENTS_TOKEN_MAX_AGE', 60),
+        }, status=status.HTTP_201_CREATED)
+
+
+class OrderEventStreamView(View):
+    """
+    Server-Sent Events stream of order.created and order.status_changed events for the current user.
+    Authenticates with the usual token header or with ?token= set to a short-lived stream token from
+    POST /api/orders/events/token/ (EventSource cannot send headers).
+    Needs the ASGI application: an idle connection is just a waiting coroutine, not a worker thread.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({"detail": "The order event stream is only available when served through ASGI."}, status=501)
+        user = await self.authenticate(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        return StreamingHttpResponse(
+            self.stream(user.pk),
+            content_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+
+    async def authenticate(self, request):
+        """
+        Resolves the user from the Authorization header or from a stream token in the token query parameter.
+        """
+        header = request.headers.get('Authorization', '')
+        if header.startswith('Token '):
+            try:
+                user, token = await sync_to_async(TokenAuthentication().authenticate_credentials)(header[len('Token '):])
+            except AuthenticationFailed:
+                return None
+            return user
+        user_id = events.read_stream_token(request.GET.get('token', ''))
+        if user_id is None:
+            return None
+        return await CustomUser.objects.filter(pk=user_id, is_active=True).afirst()
+
+    async def stream(self, user_id):
+        """
+        Yields events as they are published and a comment line every ORDER_EVENTS_HEARTBEAT seconds,
+        so proxies keep the connection open. The subscription ends when the client disconnects.
+        """
+        subscription = events.get_broker().subscribe(events.user_channel(user_id))
+        heartbeat = getattr(settings, 'ORDER_EVENTS_HEARTBEAT', 25)
+        try:
+            yield f"retry: {getattr(settings, 'ORDER_EVENTS_RETRY_MS', 5000)}\n: connected\n\n"
+            while True:
+                event = await subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield ': keepalive\n\n'
+                    continue
+                data = json.dumps(event, cls=DjangoJSONEncoder)
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+
+
+class OrderBulkStatusView(generics.GenericAPIView):
+    """
+    View to change the status of many orders at once.
+    Only the assigned business user can change an order; the result is reported per order ID.
+    """
+    serializer_class = OrderBulkStatusSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Locks the requested orders, checks ownership for the whole set with one query and
+        applies the new status with a single UPDATE. Order counters are adjusted once per batch,
+        and an order.status_changed event is published for every updated order.
+        """
+        if request.user.type != "business":
+            return Response({"detail": "Only business users can update the status of orders."}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order_ids = serializer.validated_data['order_ids']
+        new_status = serializer.validated_data['status']
+
+        with transaction.atomic():
+            orders = Order.objects.select_for_update().filter(pk__in=order_ids).only(
+                'id', 'customer_user_id', 'business_user_id', 'title', 'status'
+            )
+            current = {order.pk: order for order in orders}
+            results = {}
+            deltas = {}
+            updated = []
+            for order_id in order_ids:
+                order = current.get(order_id)
+                if order is None:
+                    results[order_id] = 'not_found'
+                elif order.business_user_id != request.user.id:
+                    results[order_id] = 'forbidden'
+                elif order.status == new_status:
+                    results[order_id] = 'unchanged'
+                else:
+                    results[order_id] = 'updated'
+                    deltas[order.status] = deltas.get(order.status, 0) - 1
+                    deltas[new_status] = deltas.get(new_status, 0) + 1
+                    updated.append(order)
+
+            updated_ids = [order.pk for order in updated]
+            if updated_ids:
+                now = timezone.now()
+                Order.objects.filter(pk__in=updated_ids).update(status=new_status, updated_at=now)
+                BusinessOrderCounter.adjust({request.user.id: deltas})
+                for order in updated:
+                    order.status = new_status
+                    order.updated_at = now
+                events.publish_order_events('order.status_changed', updated)
+
+        return Response({
+            "status": new_status,
+            "updated": len(updated_ids),
+            "results": [{"id": order_id, "result": result} for order_id, result in results.items()],
+        }, status=status.HTTP_200_OK)
+
+
 class OrderCountView(generics.RetrieveAPIView):
     """
     View to retrieve the count of in-progress orders for a business user.
     """
     serializer_class = OrderCountSerializer
     permission_classes = [AllowAny]
+    query_budget = 2
+
     def get(self, request, *args, **kwargs):
         """
         Retrieves and returns the count of in-progress orders for a given business user ID.
+        Reads the materialized counter, one query per call.
         """
-        business_user_id = self.kwargs['business_user_id']
-        get_object_or_404(CustomUser, id=business_user_id, type='business')
-
-        order_count = Order.objects.filter(business_user_id=business_user_id, status='in_progress').count()
-        serializer = self.get_serializer({'order_count': order_count})
+        counts = get_single_business_order_counts(self.kwargs['business_user_id'])
+        serializer = self.get_serializer({'order_count': counts['order_count']})
         return Response(serializer.data)
 
 
@@ -125,14 +476,43 @@ class CompletedOrderCountView(generics.RetrieveAPIView):
     """
     serializer_class = CompletedOrderCountSerializer
     permission_classes = [AllowAny]
+    query_budget = 2
 
     def get(self, request, *args, **kwargs):
         """
         Retrieves and returns the count of completed orders for a given business user ID.
+        Reads the materialized counter, one query per call.
         """
-        business_user_id = self.kwargs['business_user_id']
-        get_object_or_404(CustomUser, id=business_user_id, type='business')
+        counts = get_single_business_order_counts(self.kwargs['business_user_id'])
+        serializer = self.get_serializer({'completed_order_count': counts['completed_order_count']})
+        return Response(serializer.data)
+
+
+class BusinessOrderCountsView(generics.ListAPIView):
+    """
+    View to retrieve the order counts of many business users in one request.
+    Expects ?business_user_ids=1,2,3 and returns one entry per existing business user.
+    """
+    serializer_class = BusinessOrderCountsSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    query_budget = 2
 
-        completed_order_count = Order.objects.filter(business_user_id=business_user_id, status='completed').count()
-        serializer = self.get_serializer({'completed_order_count': completed_order_count})
-        return Response(serializer.data)
\ No newline at end of file
+    def get_queryset(self):
+        return get_business_order_counts(self.get_business_user_ids())
+
+    def get_business_user_ids(self):
+        """
+        Parses the comma-separated id list, limited to ORDER_COUNT_BATCH_MAX_IDS entries.
+        """
+        raw = self.request.query_params.get('business_user_ids', '')
+        try:
+            ids = {int(value) for value in raw.split(',') if value.strip()}
+        except ValueError:
+            raise ValidationError({'business_user_ids': 'Expected a comma-separated list of user IDs.'})
+        max_ids = getattr(settings, 'ORDER_COUNT_BATCH_MAX_IDS', 100)
+        if not ids:
+            raise ValidationError({'business_user_ids': 'This query parameter is required.'})
+        if len(ids) > max_ids:
+            raise ValidationError({'business_user_ids': f'At most {max_ids} IDs are allowed per request.'})
+        return ids
\ No newline at end of file
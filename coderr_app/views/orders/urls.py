@@ -2,10 +2,18 @@ from django.urls import path
 from .orders_views import (
     OrderListCreateView,
     OrderUpdateDestroyView,
+    OrderBulkStatusView,
+    OrderExportView,
+    OrderEventStreamView,
+    OrderEventTokenView,
 )
 
 urlpatterns = [
     path('', OrderListCreateView.as_view(), name='order-list-create'),
     path('<int:pk>/', OrderUpdateDestroyView.as_view(), name='order-update-destroy'),
+    path('bulk-status/', OrderBulkStatusView.as_view(), name='order-bulk-status'),
+    path('export/', OrderExportView.as_view(), name='order-export'),
+    path('events/', OrderEventStreamView.as_view(), name='order-events'),
+    path('events/token/', OrderEventTokenView.as_view(), name='order-events-token'),
     
 ]
\ No newline at end of file
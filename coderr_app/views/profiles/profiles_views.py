@@ -1,9 +1,17 @@
+import json
+from itertools import islice
+
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework import generics, permissions, status
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.shortcuts import get_object_or_404
+from ...conditional import ConditionalGetMixin
 from ...models import Profile
+from ...pagination import KeysetPagination, OptInPaginationMixin
+from ...streaming import stream_response
 from ...serializers.profiles.profile_serializers import ( 
     UserRegistrationSerializer,
     UserLoginSerializer,
@@ -52,18 +60,28 @@ class UserLoginView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProfileDetailView(generics.RetrieveUpdateAPIView):
+class ProfileDetailView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """
     View to retrieve and update a user profile.
     """
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
+
+    def get_conditional_state(self, request):
+        """
+        Returns the profile's updated_at, which also moves when the user fields are changed through it.
+        """
+        updated_at = Profile.objects.filter(user_id=self.kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return updated_at, (updated_at,)
 
     def get_object(self):
         """
         Retrieves a specific profile based on the user ID in the URL.
         """
-        return get_object_or_404(Profile, user_id=self.kwargs['pk'])
+        return get_object_or_404(Profile.objects.select_related('user', 'user__rating_summary'), user_id=self.kwargs['pk'])
 
 
     def patch(self, request, *args, **kwargs):
@@ -76,31 +94,80 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
                             status=status.HTTP_403_FORBIDDEN)
         return super().patch(request, *args, **kwargs)
 
-class BaseProfileListView(generics.ListAPIView):
+class ProfileCursorPagination(KeysetPagination):
+    """
+    Opt-in cursor pagination for profile lists (?pagination=cursor), in signup order.
+    """
+    ordering = (('id', False),)
+
+class BaseProfileListView(OptInPaginationMixin, ConditionalGetMixin, generics.ListAPIView):
     """
     Base view for listing profiles, should be subclassed for specific user types.
+    Without ?page=, ?page_size=, ?pagination=cursor or ?stream=1 the full list is returned as before.
     """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = None
+    cursor_pagination_class = ProfileCursorPagination
+    query_budget = 4
+    last_modified_validates = False
 
     def get_queryset(self):
         """
         Filters profiles based on the user type, which must be defined in subclasses.
+        The user and rating statistics are joined in, so every page is a single query.
         """
         if self.user_type is None:
             raise NotImplementedError("user_type must be set in subclasses.")
-        return Profile.objects.filter(user__type=self.user_type)
+        return Profile.objects.select_related('user', 'user__rating_summary').filter(user__type=self.user_type).order_by('id')
+
+    def is_streaming(self):
+        return self.request.query_params.get('stream') in ('1', 'true')
+
+    def get_conditional_state(self, request):
+        """
+        Validates the full list and page number pages. Cursor pages and streams skip the check:
+        its aggregate reads every profile of the type, which a cursor page never has to do.
+        """
+        if self.is_streaming() or self.uses_cursor_pagination():
+            return None
+        return self.get_list_conditional_state(self.get_queryset())
 
     def list(self, request, *args, **kwargs):
         """
-        Lists profiles and returns an empty list if no profiles are found.
+        Lists profiles, either as one list, as a page (?page=, ?pagination=cursor) or streamed as NDJSON (?stream=1).
         """
         queryset = self.get_queryset()
+        if self.is_streaming():
+            return self.stream(queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
-        if not queryset.exists():
-            return Response([], status=status.HTTP_200_OK)
         return Response(serializer.data)
 
+    def stream(self, queryset):
+        """
+        Streams every profile as one JSON object per line. Profiles are read with a server-side
+        iterator and serialized per chunk, so memory stays flat for any number of users.
+        """
+        chunk_size = getattr(settings, 'PROFILE_LIST_STREAM_CHUNK_SIZE', 500)
+        rows = queryset.iterator(chunk_size=chunk_size)
+
+        def chunks():
+            while True:
+                batch = list(islice(rows, chunk_size))
+                if not batch:
+                    break
+                yield ''.join(
+                    json.dumps(item, cls=DjangoJSONEncoder) + '\n'
+                    for item in self.get_serializer(batch, many=True).data
+                )
+
+        return stream_response(self.request, chunks(), content_type='application/x-ndjson')
+
 class BusinessProfileListView(BaseProfileListView):
     """
     View to list business profiles.
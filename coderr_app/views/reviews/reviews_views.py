@@ -1,8 +1,11 @@
 from rest_framework import generics, permissions, status, filters
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db import transaction
 
+from ...conditional import ConditionalGetMixin
 from ...models import Review
+from ...pagination import KeysetPagination, OptInPaginationMixin
 from ...serializers.reviews.reviews_serializers import ReviewSerializer 
 
 class IsReviewerOrReadOnly(permissions.BasePermission):
@@ -17,14 +20,60 @@ class IsReviewerOrReadOnly(permissions.BasePermission):
             return True
         return obj.reviewer == request.user
 
-class ReviewListCreateView(generics.ListCreateAPIView):
+class ReviewCursorPagination(KeysetPagination):
     """
-    View to list and create reviews. Supports filtering and ordering.
+    Opt-in cursor pagination for reviews (?pagination=cursor), newest first by default.
+    Keyed on (updated_at, id) or (rating, id), which the (business_user|reviewer, updated_at)
+    and (business_user, rating) indexes return in order.
+    """
+    orderings = {
+        'updated_at': (('updated_at', False), ('id', False)),
+        '-updated_at': (('updated_at', True), ('id', True)),
+        'rating': (('rating', False), ('id', False)),
+        '-rating': (('rating', True), ('id', True)),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Returns the keyset matching the requested ordering, newest first by default.
+        """
+        return self.orderings.get(request.query_params.get('ordering'), self.orderings['-updated_at'])
+
+class ReviewListCreateView(OptInPaginationMixin, ConditionalGetMixin, generics.ListCreateAPIView):
+    """
+    View to list and create reviews. Supports filtering, ordering and pagination.
+    Without ?page=, ?page_size= or ?pagination=cursor the full list is returned as before.
     """
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_pagination_class = ReviewCursorPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['updated_at', 'rating']
+    query_budget = 4
+    last_modified_validates = False
+
+    def get_conditional_state(self, request):
+        """
+        Validates the full list and page number pages. Cursor pages skip the check:
+        its aggregate reads every matching review, which a cursor page never has to do.
+        """
+        if self.uses_cursor_pagination():
+            return None
+        return self.get_list_conditional_state(self.filter_queryset(self.get_queryset()))
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the ordering filter with id as tie-breaker, so pages have a stable order.
+        The cursor paginator sets its own (field, id) order instead.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.uses_cursor_pagination():
+            return queryset
+        ordering = queryset.query.order_by
+        if not ordering:
+            return queryset.order_by('-updated_at', '-id')
+        tie_breaker = '-id' if ordering[-1].startswith('-') else 'id'
+        return queryset.order_by(*ordering, tie_breaker)
 
     def get_queryset(self):
         """
@@ -84,5 +133,7 @@ class ReviewUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     def perform_destroy(self, instance):
         """
         Deletes a review instance.
+        The post_delete signal removes it from the business user's rating statistics in the same transaction.
         """
-        instance.delete()
\ No newline at end of file
+        with transaction.atomic():
+            instance.delete()
\ No newline at end of file
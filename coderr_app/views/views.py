@@ -3,9 +3,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
-from ..models import FileUpload, Review, CustomUser, Offer
-from ..serializers.serializers import FileUploadSerializer
-from django.db.models import Avg
+from ..models import BusinessRating, FileUpload, CustomUser, Offer, UploadSession
+from ..serializers.serializers import FileUploadSerializer, UploadSessionSerializer
+from .. import uploads
+from django.db import transaction
+from django.db.models import Sum
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework.parsers import MultiPartParser, FormParser
 
 class FileUploadView(generics.CreateAPIView):
@@ -16,24 +20,127 @@ class FileUploadView(generics.CreateAPIView):
     serializer_class = FileUploadSerializer
     parser_classes = [MultiPartParser, FormParser]
 
+class UploadSessionCreateView(generics.CreateAPIView):
+    """
+    View to start a resumable upload.
+    """
+    serializer_class = UploadSessionSerializer
+
+    def perform_create(self, serializer):
+        """
+        Saves the session and creates its empty temp file under MEDIA_ROOT.
+        """
+        session = serializer.save(user=self.request.user)
+        uploads.create_temp_file(session)
+
+class UploadSessionDetailView(APIView):
+    """
+    View to inspect, append chunks to, or abort a resumable upload.
+    Chunks are sent as raw request bodies with an Upload-Offset header.
+    """
+    parser_classes = []
+
+    def get_session(self, request, pk):
+        return get_object_or_404(UploadSession, pk=pk, user=request.user, upload__isnull=True)
+
+    def get(self, request, pk, *args, **kwargs):
+        """
+        Returns the session, including the offset the next chunk has to start at.
+        """
+        return Response(UploadSessionSerializer(self.get_session(request, pk)).data)
+
+    def put(self, request, pk, *args, **kwargs):
+        """
+        Appends one chunk at Upload-Offset, streaming it to disk in small blocks.
+        Returns 409 with the current offset when the chunk does not continue the upload,
+        so clients only retransmit what is missing. Only the session lock is held while the
+        bytes arrive; the new offset is committed with a short conditional UPDATE, and a chunk
+        that loses that race is cut off the temp file again.
+        """
+        session = self.get_session(request, pk)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers.get('Content-Length') or 0)
+        except (KeyError, ValueError):
+            return Response({"detail": "The 'Upload-Offset' and 'Content-Length' headers are required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with uploads.get_session_lock(session.pk):
+            session.refresh_from_db(fields=['offset'])
+            if offset != session.offset:
+                return Response({"detail": "Offset mismatch.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)
+            if length <= 0 or offset + length > session.size:
+                return Response({"detail": "The chunk exceeds the declared file size.", "offset": session.offset}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                new_offset = uploads.append_chunk(session, request.stream, offset, length)
+            except uploads.UploadConflict:
+                return Response({"detail": "Offset mismatch.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)
+            updated = UploadSession.objects.filter(pk=session.pk, offset=offset, upload__isnull=True).update(
+                offset=new_offset, updated_at=timezone.now()
+            )
+            if not updated:
+                uploads.truncate(session, offset)
+                current = UploadSession.objects.filter(pk=session.pk).values_list('offset', flat=True).first()
+                return Response({"detail": "Offset mismatch.", "offset": current}, status=status.HTTP_409_CONFLICT)
+        return Response({"offset": new_offset, "size": session.size}, headers={'Upload-Offset': str(new_offset)})
+
+    def delete(self, request, pk, *args, **kwargs):
+        """
+        Aborts the upload and removes its temp file.
+        """
+        session = self.get_session(request, pk)
+        uploads.discard(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class UploadSessionFinalizeView(APIView):
+    """
+    View to turn a completed upload session into a FileUpload.
+    """
+
+    def post(self, request, pk, *args, **kwargs):
+        """
+        Verifies size and checksum, stores the file under uploaded_files/ and returns the FileUpload.
+        Repeating the call returns the same FileUpload; concurrent calls are serialized by the session lock.
+        """
+        with uploads.get_session_lock(pk), transaction.atomic():
+            session = get_object_or_404(UploadSession.objects.select_for_update(), pk=pk, user=request.user)
+            if session.upload_id is not None:
+                return Response(FileUploadSerializer(session.upload, context={'request': request}).data)
+            if session.offset != session.size:
+                return Response({"detail": "The upload is incomplete.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)
+
+            checksum = uploads.get_hasher(session).hexdigest()
+            if session.expected_checksum and checksum != session.expected_checksum:
+                return Response({"detail": "Checksum mismatch.", "checksum": checksum}, status=status.HTTP_400_BAD_REQUEST)
+
+            stored_name, checksum = uploads.finalize(session)
+            upload = FileUpload.objects.create(file=stored_name)
+            session.upload = upload
+            session.save(update_fields=['upload', 'updated_at'])
+        data = FileUploadSerializer(upload, context={'request': request}).data
+        data['checksum'] = checksum
+        return Response(data, status=status.HTTP_201_CREATED)
+
 class BaseInfoView(APIView):
     """
     View to retrieve base information like review counts, average rating, etc.
     """
     permission_classes = [AllowAny]
+    query_budget = 4
 
     def get(self, request, *args, **kwargs):
         """
         Retrieves and returns base information about the application, including review count, average rating,
         business profile count, and offer count.
         """
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(Avg('rating'))['rating__avg']
+        ratings = BusinessRating.objects.aggregate(review_count=Sum('review_count'), rating_sum=Sum('rating_sum'))
+        review_count = ratings['review_count'] or 0
         business_profile_count = CustomUser.objects.filter(type='business').count()
         offer_count = Offer.objects.count()
 
-        if average_rating is not None:
-            average_rating = round(average_rating, 1)
+        if review_count:
+            average_rating = round(ratings['rating_sum'] / review_count, 1)
         else:
             average_rating = 0
 
@@ -18,6 +18,35 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Media is served by coderr_backend.views.serve_media (streamed asynchronously under ASGI)
+# while DEBUG is on, MEDIA_SERVE is True or MEDIA_SENDFILE is set. Content-addressed blobs never change under their
+# name and are cached as immutable; other files (e.g. image derivatives) are revalidated.
+MEDIA_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MEDIA_MUTABLE_CACHE_CONTROL = 'public, no-cache'
+MEDIA_CHUNK_SIZE = 64 * 1024
+# Serve media through Django without DEBUG, e.g. from an ASGI server without a front proxy for /media/.
+MEDIA_SERVE = False
+# Set to 'x-sendfile' (Apache, lighttpd) or 'x-accel-redirect' (nginx) to let a front proxy send the files.
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# Resumable uploads (/api/upload/sessions/): temp files live in MEDIA_ROOT/FILE_UPLOAD_SESSION_DIR.
+FILE_UPLOAD_SESSION_DIR = 'upload_sessions'
+FILE_UPLOAD_MAX_SIZE = 2 * 1024 ** 3
+# Sessions without a chunk or finalize for this many seconds are removed by purge_upload_sessions.
+FILE_UPLOAD_SESSION_TTL = 24 * 60 * 60
+
+# Offer images, profile pictures and file uploads are stored once per content under
+# MEDIA_ROOT/CONTENT_STORAGE_DIR; multipart uploads are hashed while they stream in.
+CONTENT_STORAGE_DIR = 'blobs'
+# A blob that lost its last reference is kept when it was saved again within this many seconds,
+# because the row about to refer to it may not be committed yet.
+CONTENT_STORAGE_DELETE_GRACE = 60
+FILE_UPLOAD_HANDLERS = [
+    'coderr_app.storage.HashingMemoryFileUploadHandler',
+    'coderr_app.storage.HashingTemporaryFileUploadHandler',
+]
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -32,6 +61,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'coderr_app.query_budget': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
@@ -82,8 +116,13 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'coderr_app.middleware.QueryBudgetMiddleware',
 ]
 
+# Views declaring query_budget are checked by QueryBudgetMiddleware while DEBUG is on.
+# Over-budget requests are logged; set this to True to raise instead.
+QUERY_BUDGET_RAISE = False
+
 
 
 ROOT_URLCONF = 'coderr_backend.urls'
@@ -118,6 +157,81 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The local-memory caches are per process; point 'offers' at a shared backend
+# (Redis, Memcached) when running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'offers': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'offers',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+}
+
+OFFER_LIST_CACHE_ALIAS = 'offers'
+
+# Offer facets (/api/offers/facets/): lower bucket boundaries, the last bucket is open-ended.
+# Clients can override them with ?price_buckets=0,50,100 and ?delivery_buckets=1,3,7.
+OFFER_FACET_PRICE_BUCKETS = [0, 50, 100, 250, 500, 1000]
+OFFER_FACET_DELIVERY_BUCKETS = [1, 3, 7, 14, 30]
+OFFER_FACET_MAX_BUCKETS = 20
+
+# Image derivatives for offer images and profile pictures: name -> (width, height).
+# Each size is stored as WebP and JPEG next to the original by a background thread.
+IMAGE_VARIANTS = {
+    'thumb': (160, 160),
+    'card': (480, 320),
+}
+IMAGE_DERIVATIVES_ASYNC = True
+IMAGE_DERIVATIVE_WORKERS = 2
+
+# Bulk offer import (/api/offers/bulk/)
+OFFER_BULK_IMPORT_MAX_ITEMS = 10000
+OFFER_BULK_IMPORT_BATCH_SIZE = 500
+
+# GET /api/orders/ returns a plain list of at most ORDER_LIST_MAX_RESULTS orders unless ?pagination=cursor
+# is sent; set ORDER_LIST_CURSOR_BY_DEFAULT to page every request.
+ORDER_LIST_CURSOR_BY_DEFAULT = False
+ORDER_LIST_MAX_RESULTS = 500
+
+# Largest number of business users accepted by /api/order-counts/?business_user_ids=...
+ORDER_COUNT_BATCH_MAX_IDS = 100
+
+# Largest number of orders accepted by POST /api/orders/bulk-status/.
+ORDER_BULK_STATUS_MAX_IDS = 500
+
+# Stored responses of POSTs sent with an Idempotency-Key header are replayed for this many seconds.
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Default age in days after which archive_orders moves completed and cancelled orders to ArchivedOrder.
+ORDER_ARCHIVE_AFTER_DAYS = 90
+
+# Rows fetched per database round trip and written per chunk by /api/orders/export/.
+ORDER_EXPORT_CHUNK_SIZE = 2000
+
+# Profiles serialized per chunk by /api/profiles/business/?stream=1 and /api/profiles/customer/?stream=1.
+PROFILE_LIST_STREAM_CHUNK_SIZE = 500
+
+# Order events (/api/orders/events/, Server-Sent Events, ASGI only).
+# LocalBroker delivers within one process; with several workers use
+# 'coderr_app.events.RedisBroker' and set ORDER_EVENTS_REDIS_URL.
+ORDER_EVENTS_BROKER = 'coderr_app.events.LocalBroker'
+ORDER_EVENTS_REDIS_URL = 'redis://localhost:6379/0'
+# Seconds a stream token from POST /api/orders/events/token/ can be used to open the stream.
+ORDER_EVENTS_TOKEN_MAX_AGE = 60
+ORDER_EVENTS_QUEUE_SIZE = 100
+ORDER_EVENTS_HEARTBEAT = 25
+ORDER_EVENTS_RETRY_MS = 5000
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
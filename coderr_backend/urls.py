@@ -15,15 +15,20 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
-from django.conf.urls.static import static
+from django.urls import path, include, re_path
 from django.conf import settings
 
+from .views import serve_media
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('coderr_app.urls')), 
-    
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Media is routed through Django with DEBUG, with MEDIA_SERVE (the async view streams ranges without
+# holding a worker) or when a front proxy sends the files (MEDIA_SENDFILE).
+if settings.DEBUG or getattr(settings, 'MEDIA_SERVE', False) or getattr(settings, 'MEDIA_SENDFILE', None):
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+    ]
\ No newline at end of file
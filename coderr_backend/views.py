@@ -0,0 +1,179 @@
+import asyncio
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from coderr_app.storage import is_content_addressed_name
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_media_settings():
+    return {
+        'chunk_size': getattr(settings, 'MEDIA_CHUNK_SIZE', 64 * 1024),
+        'cache_control': getattr(settings, 'MEDIA_CACHE_CONTROL', 'public, max-age=31536000, immutable'),
+        'mutable_cache_control': getattr(settings, 'MEDIA_MUTABLE_CACHE_CONTROL', 'public, no-cache'),
+        'private_dirs': [getattr(settings, 'FILE_UPLOAD_SESSION_DIR', 'upload_sessions')],
+        'sendfile': getattr(settings, 'MEDIA_SENDFILE', None),
+        'accel_prefix': getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/'),
+    }
+
+
+def parse_range(header, size):
+    """
+    Parses a single "bytes=start-end" range.
+    Returns (start, end) inclusive, None for a missing or unsupported header,
+    or False when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def range_applies(request, etag, mtime):
+    """
+    Honours If-Range: the range is only served if the validator still matches.
+    """
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+async def read_chunks(path, start, length, chunk_size):
+    """
+    Streams a byte range of a file, doing the blocking reads in a worker thread
+    so the event loop stays free while the client downloads.
+    """
+    handle = await asyncio.to_thread(open, path, 'rb')
+    try:
+        await asyncio.to_thread(handle.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(handle.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
+
+
+def read_chunks_sync(path, start, length, chunk_size):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def serve_media(request, path):
+    """
+    Serves a file from MEDIA_ROOT with ETag/Last-Modified validation and byte ranges.
+    Content-addressed blobs are cached as immutable; every other file (e.g. image derivatives,
+    which are regenerated under the same name) must be revalidated. Files of resumable uploads
+    in progress are never served.
+    Under ASGI the body is streamed from an async iterator; with MEDIA_SENDFILE set to
+    'x-sendfile' or 'x-accel-redirect' the transfer is handed to the front proxy instead.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    options = get_media_settings()
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('File not found.')
+    relative_path = os.path.relpath(full_path, os.path.abspath(settings.MEDIA_ROOT)).replace(os.sep, '/')
+    if any(relative_path == name or relative_path.startswith(name.rstrip('/') + '/') for name in options['private_dirs']):
+        raise Http404('File not found.')
+    try:
+        file_stat = await asyncio.to_thread(os.stat, full_path)
+    except OSError:
+        raise Http404('File not found.')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('File not found.')
+
+    size = file_stat.st_size
+    mtime = file_stat.st_mtime
+    etag = '"%x-%x"' % (file_stat.st_mtime_ns, size)
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    cache_control = options['cache_control'] if is_content_addressed_name(relative_path) else options['mutable_cache_control']
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        not_modified['Cache-Control'] = cache_control
+        return not_modified
+
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(mtime),
+        'Cache-Control': cache_control,
+        'Accept-Ranges': 'bytes',
+    }
+    if encoding:
+        headers['Content-Encoding'] = encoding
+
+    if options['sendfile']:
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if options['sendfile'] == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = options['accel_prefix'].rstrip('/') + '/' + path.lstrip('/')
+        else:
+            response['X-Sendfile'] = full_path
+        return response
+
+    start, end = 0, size - 1
+    status = 200
+    byte_range = parse_range(request.headers.get('Range'), size) if range_applies(request, etag, mtime) else None
+    if byte_range is False:
+        headers['Content-Range'] = f'bytes */{size}'
+        return HttpResponse(status=416, headers=headers)
+    if byte_range:
+        start, end = byte_range
+        status = 206
+        headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    length = end - start + 1 if size else 0
+    headers['Content-Length'] = str(length)
+
+    if request.method == 'HEAD':
+        return HttpResponse(status=status, content_type=content_type, headers=headers)
+    if isinstance(request, ASGIRequest):
+        content = read_chunks(full_path, start, length, options['chunk_size'])
+        return StreamingHttpResponse(content, status=status, content_type=content_type, headers=headers)
+    if status == 200:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+    content = read_chunks_sync(full_path, start, length, options['chunk_size'])
+    return StreamingHttpResponse(content, status=status, content_type=content_type, headers=headers)